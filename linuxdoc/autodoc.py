@@ -79,7 +79,7 @@ def main():
 
     if CMD.threads > 1:
         # pylint: disable=consider-using-with
-        pool = multiprocessing.Pool(CMD.threads)
+        pool = kerneldoc.get_pool(CMD.threads, CMD.backend)
         pool.map(autodoc_file, gather_filenames(CMD))
         pool.close()
         pool.join()
@@ -119,6 +119,12 @@ def get_cli():
         default=multiprocessing.cpu_count(),
         help="Use up to n threads.",
     )
+    cli.add_argument(
+        "--backend",
+        choices=kerneldoc.POOL_BACKENDS,
+        default="auto",
+        help=kerneldoc.POOL_BACKEND_HELP,
+    )
     cli.add_argument(
         "--markup",
         choices=["reST", "kernel-doc"],
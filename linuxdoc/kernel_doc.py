@@ -51,10 +51,12 @@ n-times.
 import codecs
 import collections
 import copy
+import multiprocessing
+import multiprocessing.pool
 import os
 import re
 import sys
-import textwrap
+import threading
 
 import six
 from fspath import OS_ENV
@@ -73,19 +75,27 @@ __version__ = "1.0"
 
 
 class RE(object):
-    """regular expression that stores last match (like Perl's ``=~`` operator)"""
+    """regular expression that stores last match (like Perl's ``=~`` operator)
+
+    The last match is stored thread-local, the (module global) RE objects can be
+    used by parsers running concurrently in different threads.
+    """
 
     def __init__(self, *args, **kwargs):
         self.re = re.compile(*args, **kwargs)
-        self.last_match = None
+        self._local = threading.local()
+
+    @property
+    def last_match(self):
+        return getattr(self._local, "last_match", None)
 
     def match(self, *args, **kwargs):
-        self.last_match = self.re.match(*args, **kwargs)
-        return self.last_match
+        self._local.last_match = m = self.re.match(*args, **kwargs)
+        return m
 
     def search(self, *args, **kwargs):
-        self.last_match = self.re.search(*args, **kwargs)
-        return self.last_match
+        self._local.last_match = m = self.re.search(*args, **kwargs)
+        return m
 
     def __getattr__(self, attr):
         return getattr(self.re, attr)
@@ -154,6 +164,147 @@ reST_sect = RE(doc_com_section.pattern + r"(" r"\w[\w\s]+\w" + r")" + r":\s*$")
 doc_content = RE(doc_com_body.pattern + r"(.*)")
 doc_block = RE(doc_com.pattern + r"DOC:\s*(.*)?")
 
+# The lines of a comment (state 2) are classified without the regexps from
+# above, classify_doc_line_re is the reference implementation.
+
+DOC_SECT_NAMES = {
+    "description",
+    "context",
+    "return",
+    "returns",
+    "note",
+    "notes",
+    "example",
+    "examples",
+    "introduction",
+    "intro",
+}
+# case insensitive match of the (non ASCII) DOC_SECT_NAMES in doc_sect_reST
+DOC_SECT_NAME = RE(
+    r"description|context|returns?|notes?|examples?|introduction|intro",
+    flags=re.IGNORECASE,
+)
+
+
+def is_word_char(c):
+    """Test if *c* is a word char (``\\w``)."""
+    return c.isalnum() or c == "_"
+
+
+def is_sect_name(name):
+    """Test if *name* is a section name (``\\w[\\w\\s]+\\w``)."""
+    return (
+        len(name) > 2
+        and not name[0].isspace()
+        and not name[-1].isspace()
+        and "".join(name.split()).replace("_", "a").isalnum()
+    )
+
+
+def has_colon_text(text, start):
+    """Test if a colon followed by a non whitespace char is in *text* (at or
+    behind index *start*)."""
+    pos = text.find(":", start)
+    while pos != -1:
+        if text[pos + 1 : pos + 2].strip():
+            return True
+        pos = text.find(":", pos + 1)
+    return False
+
+
+def is_doc_sect_name(name):
+    """Test if *name* is one of the :py:obj:`DOC_SECT_NAMES` (case insensitive)."""
+    if name.isascii():
+        return name.lower() in DOC_SECT_NAMES
+    return bool(DOC_SECT_NAME.fullmatch(name))
+
+
+DOC_LINE_KINDS = {
+    # (starts with "*", contains "*/")
+    (True, False): "content",
+    (True, True): "end",
+    (False, True): "end",
+    (False, False): None,
+}
+"""The kind of a comment line, which is not a section header."""
+
+
+def scan_doc_sect(rest, markup):
+    """Scan the text *rest* behind the leading ``*`` of a comment line for a
+    section header.
+
+    Returns a tuple ``(sect, title)``, *sect* is the ``(name, cont)`` of the
+    section header or ``None`` and *title* is ``True`` if the text is a reST
+    section title, e.g. ``lorem:``.
+    """
+    body = rest.lstrip()
+    sect, title = None, False
+    # no section title behind more than 8 spaces and none matching
+    # doc_sect_except (e.g. "http://")
+    if not body or not 0 < len(rest) - len(body) <= 8:
+        return sect, title
+    colon = body.find(":")
+    if body[0] == "@":
+        # "@foo: lorem", "@foo.bar: lorem" or "@...: lorem"
+        if colon != -1 and (is_word_char(body[1]) or body.startswith("@...:")):
+            sect = (body[:colon], body[colon + 1 :].rstrip())
+    elif colon > 0 and not has_colon_text(body, 1):
+        name, cont = body[:colon], body[colon + 1 :]
+        title = not cont.strip() and is_sect_name(name)
+        if markup == "reST":
+            is_sect = title or is_doc_sect_name(name)
+        else:
+            is_sect = is_sect_name(name)
+        if is_sect:
+            sect = (name, cont.rstrip())
+    return sect, title
+
+
+def classify_doc_line(line, markup="reST", sections=True):
+    """Classify a *line* of a kernel-doc comment (state 2) in one pass.
+
+    Returns a tuple ``(kind, value, extra)``:
+
+    - ``("sect", name, cont)``: header of a section, e.g. ``@foo: lorem`` or
+      ``Return: lorem`` (not tested if *sections* is ``False``)
+    - ``("end", None, None)``: end of the comment ``*/``
+    - ``("content", text, title)``: content of a section, *title* is ``True`` if
+      the line is a reST section title, e.g. ``lorem:``
+    - ``(None, None, None)``: a bad line
+
+    The result is the same as from :py:obj:`classify_doc_line_re`.
+    """
+    text = line.lstrip()
+    in_doc = text[:1] == "*"
+    rest = text[1:]
+    sect, title = scan_doc_sect(rest, markup) if in_doc else (None, False)
+    if sections and sect is not None:
+        return ("sect",) + sect
+    kind = DOC_LINE_KINDS[in_doc, "*/" in line]
+    if kind == "content":
+        return (kind, rest[1:] if rest[:1] == " " else rest, title)
+    return (kind, None, None)
+
+
+def classify_doc_line_re(line, markup="reST", sections=True):
+    """Reference implementation of :py:obj:`classify_doc_line`."""
+    sect_except = doc_sect_except.match(line)
+    if sections and not sect_except:
+        if markup == "reST":
+            if doc_sect_reST.match(line):
+                return ("sect", doc_sect_reST[0], doc_sect_reST[1])
+            if reST_sect.match(line):
+                return ("sect", reST_sect[0], "")
+        elif doc_sect.match(line):
+            return ("sect", doc_sect[0], doc_sect[1])
+    if doc_end.search(line):
+        return ("end", None, None)
+    if doc_content.match(line):
+        title = bool(reST_sect.match(line)) and not sect_except
+        return ("content", doc_content[0], title)
+    return (None, None, None)
+
+
 # state: 5 - gathering documentation outside main block
 doc_state5_start = RE(r"^\s*/\*\*\s*$")
 doc_state5_sect = RE(r"\s*\*\s*(@\s*[\w][\w\.]*\s*):(.*)")
@@ -183,6 +334,11 @@ C89_comments = RE(r"/\*.*?\*/")
 C_STRUCT = RE(r"struct\s+(\w+)\s*{(.*)}")
 C_UNION = RE(r"union\s+(\w+)\s*{(.*)}")
 C_STRUCT_UNION = RE(r"(struct|union)\s+(\w+)\s*{(.*)}")
+# nested struct/union: the head in front of the "{" and the identifiers behind
+# the "}" (see Parser.flatten_nested)
+NESTED_HEAD = RE(r"(struct|union)([^{};]+)$")
+NESTED_IDS = RE(r"([^{};]*)([{};]?)")
+NESTED_PTR_TO_FUNC = RE(r"^([^\(]+\(\*?\s*)([\w\.]*)(\s*\).*)")
 C_ENUM = RE(r"enum\s+(\w+)\s*{(.*)}")
 C_TYPEDEF = RE(r"typedef.*\s+(\w+)\s*;")
 
@@ -195,6 +351,8 @@ C_FUNC_TYPEDEF = RE(
 )
 C_FUNC_TYPEDEF_2 = RE(r"typedef" + _typedef_type + _typedef_ident + _typedef_args)
 
+PROTO_DELIMITERS = RE(r"[{};]")
+
 MACRO = RE(r"^#")
 MACRO_define = RE(r"^#\s*define\s+")
 
@@ -209,26 +367,114 @@ DEFINE_EVENT_name = RE(r"DEFINE_EVENT\((.*?),(.*?),")
 DEFINE_SINGLE_EVENT = RE(r"DEFINE_SINGLE_EVENT")
 DEFINE_SINGLE_EVENT_name = RE(r"DEFINE_SINGLE_EVENT\((.*?),")
 
-FUNC_PROTOTYPES = [
-    # RE(r"^(\w+)\s+\(\*([a-zA-Z0-9_]+)\)\s*\(([^\(]*)\)") # match: void (*foo) (int bar);
-    RE(r"^()([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
-    RE(r"^(\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
-    RE(r"^(\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
-    RE(r"^(\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
-    RE(r"^(\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
-    RE(r"^(\w+\s+\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
-    RE(r"^(\w+\s+\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
-    RE(r"^()([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s+\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s+\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s+\w+\s+\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s+\w+\s+\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-    RE(r"^(\w+\s+\w+\s*\*\s*\w+\s*\*+\s*)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
-]
+# storage class and inline specifiers in front of a function prototype (removed
+# in this order)
+PROTO_SPECIFIERS = RE(
+    r"^(?:static +)?(?:extern +)?(?:asmlinkage +)?(?:inline +)?(?:__inline__ +)?"
+    r"(?:__inline +)?(?:__always_inline +)?(?:noinline +)?"
+)
+
+PROTO_QUALIFIERS = ["__init", "__init_or_module", "__meminit", "__must_check", "__weak"]
+"""Qualifiers removed from function prototypes (see
+:py:obj:`ParseOptions.get_proto_attrs_re`)"""
+
+PROTO_NAME_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_~:"
+)
+
+
+def split_prototype(proto):
+    """Split a function prototype into return type, name and parameters.
+
+    Returns the tuple ``(return_type, decl_name, parameters)`` or ``None`` if
+    the prototype is not understood.  The prototype is scanned once, the result
+    is the same as from the first matching pattern of the regular expressions
+    used in former versions (see ``tests/test_prototype.py``), except that the
+    number of words in the return type is not limited.
+    """
+    start = proto.find("(")
+    if start < 0:
+        return None
+    head = proto[:start].rstrip()
+    pos = len(head)
+    while pos and head[pos - 1] in PROTO_NAME_CHARS:
+        pos -= 1
+    if pos == len(head):
+        return None
+    return_type = split_return_type(head[:pos])
+    if return_type is None:
+        return None
+    return_type, words = return_type
+
+    # words of the return type are limited in the patterns with parameters
+    # up to the next "(" ..
+    parameters = None
+    if words <= 3:
+        parameters = proto_parameters(proto, start, "(")
+    # .. but not in the patterns with parameters up to the next "{"
+    if parameters is None:
+        parameters = proto_parameters(proto, start, "{")
+    if parameters is None:
+        return None
+    return return_type, head[pos:], parameters
+
+
+def split_return_type(head):
+    """Scan the return type in front of the function name.
+
+    Returns the tuple ``(return_type, words)`` or ``None`` if *head* is not a
+    return type.  A return type is a sequence of words optionally followed by
+    pointer stars (e.g. ``unsigned long *``) or the form ``const char * const
+    *``."""
+    shape = []
+    pos, size = 0, len(head)
+    while pos < size:
+        c = head[pos]
+        end = pos + 1
+        if c == "*":
+            while end < size and head[end] == "*":
+                end += 1
+            shape.append("*" if end - pos == 1 else "+")
+        elif c.isspace():
+            while end < size and head[end].isspace():
+                end += 1
+            shape.append(" ")
+        elif c.isalnum() or c == "_":
+            while end < size and (head[end].isalnum() or head[end] == "_"):
+                end += 1
+            shape.append("w")
+        else:
+            return None
+        pos = end
+
+    if not shape:
+        return "", 0
+    if shape[0] != "w":
+        return None
+    shape = "".join(shape)
+    core = shape.replace(" ", "")
+    words = core.rstrip("*+")
+    stars = len(core) - len(words)
+    # the function name is separated by whitespace or by the pointer stars
+    if words == "w" * len(words) and (stars == 1 or (not stars and shape[-1] == " ")):
+        return head.rstrip(), len(words)
+    if core in ("ww*w*", "ww*w+"):
+        # whitespace in front of the function name is a part of the return type
+        return head, 4
+    return None
+
+
+def proto_parameters(proto, start, stop):
+    """Returns the parameters between the "(" at index *start* and the last ")"
+    in front of the next *stop* char (``None`` if there is no ")")."""
+    end = proto.find(stop, start + 1)
+    if end < 0:
+        end = len(proto)
+    end = proto.rfind(")", start + 1, end)
+    if end < 0:
+        return None
+    return proto[start + 1 : end]
+
 
 # MODULE_AUTHOR("..."); /  MODULE_DESCRIPTION("..."); / MODULE_LICENSE("...");
 #
@@ -249,6 +495,41 @@ def normalize_ws(string):
     return string.strip()
 
 
+def split_toplevel(string, sep):
+    """Split *string* by the separator char *sep* (like ``string.split(sep)``).
+
+    Separators inside of parentheses and brackets are ignored, e.g. the commas
+    in the function pointer parameter ``void (*cb)(int a, int b)``."""
+    parts = []
+    depth = start = 0
+    for match in re.finditer(r"[\[\]()%s]" % re.escape(sep), string):
+        c = match.group()
+        if c == sep:
+            if not depth:
+                parts.append(string[start : match.start()])
+                start = match.end()
+        elif c in "([":
+            depth += 1
+        elif depth:
+            depth -= 1
+    parts.append(string[start:])
+    return parts
+
+
+def comment_starts(text):
+    """Generator of the line indices of the lines in *text* starting with
+    ``/*`` (the candidates of a kernel-doc comment or a parse-option)."""
+    if text.startswith("/*"):
+        yield 0
+    line = prev = 0
+    pos = text.find("\n/*")
+    while pos != -1:
+        line += text.count("\n", prev, pos + 1)
+        prev = pos + 1
+        yield line
+        pos = text.find("\n/*", prev)
+
+
 ID_CHARS = RE(r"[^A-Za-z0-9\._]")
 
 
@@ -278,43 +559,187 @@ def map_row(row, map_table):
     return row
 
 
+class HighlightMap(object):
+    """Single pass substitution of a *map_table* (compare :py:obj:`map_row`).
+
+    The regular expressions of the *map_table* are combined into one alternation
+    with named groups, the substitute of the matching group is looked up in a
+    dispatch table.  The result is the same as from :py:obj:`map_row`, as long
+    as the substitutes do not contain text that is matched by a regular
+    expression later in the *map_table* and lookbehinds are leading and one
+    character wide.  Rows where the single pass can't decide --- a match of a
+    regular expression inside the match of a later one or a match right behind a
+    substitute --- are substituted by :py:obj:`map_row`.
+    """
+
+    LEADING_LOOKBEHIND = re.compile(r"^\(\?<[=!](?:[^()\\]|\\.)*\)")
+    TEMPLATE_ESCAPE = re.compile(r"\\(?:(\d+)|g<(\d+)>|(.))", flags=re.S)
+
+    def __init__(self, map_table):
+        self.map_table = [(r, s) for r, s in map_table if s is not None]
+        self.dispatch = {}
+        # self.earlier[i]: matches of the regular expressions before the i-th
+        self.earlier = []
+        # self.behind[i]: matches of the regular expressions after the i-th,
+        # whose leading lookbehind might see the substitute of the i-th
+        self.behind = []
+
+        flags = self.map_table[0][0].flags if self.map_table else 0
+        group_offset = 0
+        for i, (regexpr, substitute) in enumerate(self.map_table):
+            if regexpr.flags != flags:
+                raise ValueError("map table with mixed regular expression flags")
+            group_offset += 1
+            self.dispatch["map%d" % i] = (
+                i,
+                self.parse_template(substitute, group_offset),
+            )
+            group_offset += regexpr.groups
+
+        patterns = [regexpr.pattern for regexpr, _ in self.map_table]
+        for i in range(len(patterns)):
+            self.earlier.append(self.compile_alternation(patterns[:i], flags))
+            later = []
+            for pattern in patterns[i + 1 :]:
+                bare = self.LEADING_LOOKBEHIND.sub("", pattern)
+                if bare != pattern:
+                    later.append(bare)
+            self.behind.append(self.compile_alternation(later, flags))
+
+        self.regexpr = self.compile_alternation(
+            patterns, flags, names=["map%d" % i for i in range(len(patterns))]
+        )
+
+    @classmethod
+    def compile_alternation(cls, patterns, flags, names=None):
+        """Returns the alternation of the *patterns* (in the given order) or
+        ``None``.
+
+        Consecutive patterns with the same leading lookbehind share the
+        lookbehind, which is much faster to match.  With *names*, each pattern
+        is a named group.
+        """
+        if not patterns:
+            return None
+        runs = []  # [(lookbehind, [pattern, ...]), ...]
+        for i, pattern in enumerate(patterns):
+            lookbehind = cls.LEADING_LOOKBEHIND.match(pattern)
+            lookbehind = lookbehind.group(0) if lookbehind else ""
+            pattern = pattern[len(lookbehind) :]
+            if names is None:
+                pattern = "(?:%s)" % pattern
+            else:
+                pattern = "(?P<%s>%s)" % (names[i], pattern)
+            if runs and runs[-1][0] == lookbehind:
+                runs[-1][1].append(pattern)
+            else:
+                runs.append((lookbehind, [pattern]))
+        return re.compile(
+            "|".join("%s(?:%s)" % (lb, "|".join(run)) for lb, run in runs), flags
+        )
+
+    @classmethod
+    def parse_template(cls, template, group_offset):
+        """Returns the substitute *template* as list of strings and (shifted)
+        group numbers"""
+        parts = []
+        pos = 0
+        for m in cls.TEMPLATE_ESCAPE.finditer(template):
+            parts.append(template[pos : m.start()])
+            pos = m.end()
+            group, named, char = m.groups()
+            if group or named:
+                parts.append(int(group or named) + group_offset)
+            elif char == "\\":
+                parts.append("\\")
+            elif char.isascii() and char.isalpha():
+                raise ValueError("unsupported escape in template %r" % template)
+            else:
+                parts.append(m.group(0))
+        parts.append(template[pos:])
+        return [p for p in parts if p != ""]
+
+    def map_row(self, row):
+        if not self.map_table:
+            return row
+        undecided = []
+
+        def substitute(match):
+            i, parts = self.dispatch[match.lastgroup]
+            string = match.string
+            start, end = match.span()
+            if self.earlier[i] is not None and end - start > 1:
+                earlier = self.earlier[i].search(string, start + 1)
+                if earlier is not None and earlier.start() < end:
+                    undecided.append(match)
+            text = "".join(
+                p if isinstance(p, str) else (match.group(p) or "") for p in parts
+            )
+            if (
+                self.behind[i] is not None
+                and text[-1:] != string[end - 1 : end]
+                and self.behind[i].match(string, end)
+            ):
+                undecided.append(match)
+            return text
+
+        # python has only fixed width lookbehind: add temporarily leading space
+        new_row = self.regexpr.sub(substitute, " " + row)[1:]
+        if undecided:
+            return map_row(row, self.map_table)
+        return new_row
+
+
+HIGHLIGHT_MAPS = {}
+
+
+def get_highlight_map(map_table):
+    """Returns the (cached) :py:obj:`HighlightMap` of the *map_table*"""
+    key = tuple(map_table)
+    hmap = HIGHLIGHT_MAPS.get(key)
+    if hmap is None:
+        hmap = HIGHLIGHT_MAPS[key] = HighlightMap(map_table)
+    return hmap
+
+
 def highlight_parser(text, map_table):
+    return "\n".join(highlight_rows(text.splitlines(), map_table))
+
+
+def highlight_rows(rows, map_table):
+    """Highlight the *rows* (list of strings) by the *map_table* and return the
+    highlighted rows, rows of literal blocks are passed through."""
+    hmap = get_highlight_map(map_table)
     block_indent = 0
     row_indent = 0
     state = "highlight"  # [highlight|literal]
     out = []
-    in_rows = text.splitlines()
 
-    while in_rows:
-        row = in_rows.pop(0)
+    for row in rows:
 
         if not row.strip():  # pass-through empty lines & continue
             out.append(row)
             continue
 
-        RST_INDENT.search(row)
-        indent = len(RST_INDENT[0].expandtabs())
-
-        if state == "highlight":
-            out.append(map_row(row, map_table))
-            # prepare next state
-            if RST_LITERAL_BLOCK.search(row) or RST_CODE_BLOCK.search(row):
-                state = "literal"
-                block_indent = row_indent + 1
-            continue
-
         if state == "literal":
-            if indent < block_indent:
-                # this is a new block, push row back onto the stack and repeat
-                # the loop
-                state = "highlight"
-                block_indent = indent
-                in_rows.insert(0, row)
+            RST_INDENT.search(row)
+            indent = len(RST_INDENT[0].expandtabs())
+            if indent >= block_indent:
+                out.append(row)
                 continue
+            # this is a new block, highlight the row
+            state = "highlight"
+            block_indent = indent
+
+        out.append(hmap.map_row(row))
+        # prepare next state, both patterns end with "::"
+        if "::" in row and (
+            RST_LITERAL_BLOCK.search(row) or RST_CODE_BLOCK.search(row)
+        ):
+            state = "literal"
+            block_indent = row_indent + 1
 
-            out.append(row)
-
-    return "\n".join(out)
+    return out
 
 
 # ==============================================================================
@@ -322,6 +747,46 @@ def highlight_parser(text, map_table):
 # ==============================================================================
 
 
+def is_free_threaded():
+    """``True`` if the interpreter runs without the GIL (free-threaded build).
+
+    On a free-threaded interpreter, parsers running in a thread pool scale over
+    the CPU cores and a thread pool is prefered over a process pool.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    # sys._is_gil_enabled is new in Python 3.13, pylint can't infer it
+    # pylint: disable-next=not-callable
+    return callable(is_gil_enabled) and not is_gil_enabled()
+
+
+POOL_BACKENDS = ["auto", "process", "thread"]
+"""Backends of :py:obj:`get_pool`."""
+
+POOL_BACKEND_HELP = (
+    "Run the threads in a pool of processes or in a pool of threads."
+    " With 'auto' a thread pool is used on free-threaded (no-GIL)"
+    " Python interpreters and a process pool otherwise."
+)
+"""Help text of the ``--backend`` command line option."""
+
+
+def get_pool(processes, backend="auto"):
+    """Returns a pool with *processes* workers.
+
+    :param backend: ``thread`` returns a :py:obj:`multiprocessing.pool.ThreadPool`
+        and ``process`` a :py:obj:`multiprocessing.pool.Pool`.  With ``auto``
+        the thread pool is used on a free-threaded interpreter (see
+        :py:obj:`is_free_threaded`), otherwise the process pool.
+    """
+    if backend == "auto":
+        backend = "thread" if is_free_threaded() else "process"
+    if backend == "thread":
+        return multiprocessing.pool.ThreadPool(processes)
+    if backend == "process":
+        return multiprocessing.Pool(processes)
+    raise ValueError("unknown pool backend: %s" % backend)
+
+
 def openTextFile(fname, mode="r", encoding="utf-8", errors="strict"):
     return codecs.open(fname, mode=mode, encoding=encoding, errors=errors)
 
@@ -331,6 +796,24 @@ def readFile(fname, encoding="utf-8", errors="strict"):
         return f.read()
 
 
+def dedent_lines(lines):
+    """Remove the common leading whitespace from the *lines* (list of strings),
+    lines consisting solely of blanks and tabs are normalized to an empty
+    string.  Same as ``textwrap.dedent("\\n".join(lines)).split("\\n")``."""
+    margin = None
+    for line in lines:
+        text = line.lstrip(" \t")
+        if not text:
+            continue
+        indent = line[: len(line) - len(text)]
+        if margin is None:
+            margin = indent
+        elif not indent.startswith(margin):
+            margin = os.path.commonprefix((margin, indent))
+    cut = len(margin or "")
+    return [line[cut:] if line.lstrip(" \t") else "" for line in lines]
+
+
 class Container(dict):
     @property
     def __dict__(self):
@@ -371,47 +854,139 @@ STREAM = Container(
 
 VERBOSE = False
 DEBUG = False
-INSPECT = False
 
 
 class SimpleLog(object):
 
     LOG_FORMAT = "%(logclass)s: %(message)s\n"
 
+    # Log settings of the instance, if unset (None) the module globals VERBOSE,
+    # DEBUG and STREAM.log_out are used.
+    log_verbose = None
+    log_debug = None
+    log_out = None
+
     def error(self, message, **replace):
         message = message % replace
         replace.update(dict(message=message, logclass="ERROR"))
-        STREAM.log_out.write(self.LOG_FORMAT % replace)
+        (self.log_out or STREAM.log_out).write(self.LOG_FORMAT % replace)
 
     def warn(self, message, **replace):
         message = message % replace
         replace.update(dict(message=message, logclass="WARN"))
-        STREAM.log_out.write(self.LOG_FORMAT % replace)
+        (self.log_out or STREAM.log_out).write(self.LOG_FORMAT % replace)
 
     def info(self, message, **replace):
-        if not VERBOSE:
+        if not (VERBOSE if self.log_verbose is None else self.log_verbose):
             return
         message = message % replace
         replace.update(dict(message=message, logclass="INFO"))
-        STREAM.log_out.write(self.LOG_FORMAT % replace)
+        (self.log_out or STREAM.log_out).write(self.LOG_FORMAT % replace)
 
     def debug(self, message, **replace):
-        if not DEBUG:
+        if not (DEBUG if self.log_debug is None else self.log_debug):
             return
         message = message % replace
         replace.update(dict(message=message, logclass="DEBUG"))
-        STREAM.log_out.write(self.LOG_FORMAT % replace)
+        (self.log_out or STREAM.log_out).write(self.LOG_FORMAT % replace)
 
 
 LOG = SimpleLog()
 
 
+class LRUCache(object):
+    """A thread-safe, bounded LRU cache that counts its hits and misses (see
+    :py:obj:`LRUCache.stats`).  It is the storage of the :py:obj:`HIGHLIGHT_CACHE`
+    and of the caches of the kernel-doc directive (:py:obj:`NODES_CACHE
+    <linuxdoc.rstKernelDoc.NODES_CACHE>` and :py:obj:`PARSER_CACHE
+    <linuxdoc.rstKernelDoc.PARSER_CACHE>`).
+
+    :param maxsize: Maximal number of values in the cache, if the cache is full,
+        the least recently used value is dropped.  ``0`` (default) turns the
+        cache off, ``None`` means the cache is unbounded.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the cached value of *key* or ``None`` if *key* is not in the
+        cache."""
+        if self.maxsize == 0:
+            return None
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._cache) > max(self.maxsize, 0):
+                    self._cache.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def lookup(self, key, func, *args):
+        """Returns the cached value of *key*, if *key* is not in the cache, the
+        value ``func(*args)`` is added to the cache."""
+        value = self.get(key)
+        if value is None:
+            value = func(*args)
+            self.set(key, value)
+        return value
+
+    def stats(self):
+        """Returns a dictionary with the number of *hits*, *misses*, the
+        *hit_rate* and the current *size* of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                hit_rate=(self.hits / lookups) if lookups else 0.0,
+                size=len(self._cache),
+                maxsize=self.maxsize,
+            )
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+HIGHLIGHT_CACHE = LRUCache()
+"""The cache of highlighted text fragments used by the :py:obj:`ReSTTranslator`.
+
+Parameter descriptions like "pointer to the device" and short purposes are
+repeated many times in a source tree, with the cache a repeated fragment is
+highlighted only once.  By default the cache is off (see :py:obj:`LRUCache`)."""
+
+
 class TranslatorAPI(object):
     """
     Abstract kernel-doc translator.
 
     :cvar list cls.HIGHLIGHT_MAP:  highlight mapping
     :cvar tuple cls.LINE_COMMENT:  tuple with start-/end- comment tags
+    :cvar tuple cls.RENDER_OPTIONS: names of the options the output of a
+        declaration depends on, ``None`` if the output of the translator can't
+        be cached (see :py:obj:`Parser.translate_decl`)
     """
 
     HIGHLIGHT_MAP = [
@@ -427,12 +1002,15 @@ class TranslatorAPI(object):
     ]
 
     LINE_COMMENT = ("# ", "")
+    RENDER_OPTIONS = None
 
     def __init__(self):
         self.options = None
         self.parser = None
         self.dumped_names = []
         self.translated_names = set()
+        # buffered output: [(offset, [fragment, ...]), ...]
+        self.chunks = []
 
     def setParser(self, parser):
         self.parser = parser
@@ -481,17 +1059,50 @@ class TranslatorAPI(object):
                 retVal.append("")
         return "\n".join(retVal)
 
-    def write(self, *objects):
+    def write(self, *objects, offset=None):
         """Write *objects* to stream.
 
-        Write Unicode-values of the *objects* to :py:attr:``self.options.out``.
+        The Unicode-values of the *objects* are buffered, the buffer is written
+        to :py:attr:``self.options.out`` by :py:obj:`TranslatorAPI.flush`.
 
         :param objects: The positional arguments are the objects with the
             content to write.
+        :param offset: The line offset in the source file of the content,
+            defaults to the offset of the parser (``ctx.offset``).  Used to
+            write the chunks returned by :py:obj:`TranslatorAPI.flush` again.
         """
-        for obj in objects:
-            cont = six.text_type(obj)
-            self.options.out.write(cont)
+        if offset is None and self.parser is not None:
+            offset = self.parser.ctx.offset
+        chunks = self.chunks
+        if not chunks or chunks[-1][0] != offset:
+            chunks.append((offset, []))
+        chunks[-1][1].extend(objects)
+
+    def flush(self):
+        """Write the buffered content to :py:attr:``self.options.out`` and
+        return the written ``(offset, text)`` chunks.
+
+        The parser flushes the translator once per declaration.  If the output
+        has a ``write_chunks`` method, the content is passed in a list of
+        ``(offset, text)`` chunks, where *offset* is the line offset in the
+        source file (``ctx.offset`` of the parser) when *text* was written.
+        Otherwise the content is written by one call of the ``write`` method.
+        """
+        if not self.chunks:
+            return []
+        chunks = []
+        for offset, fragments in self.chunks:
+            try:
+                chunks.append((offset, "".join(fragments)))
+            except TypeError:
+                chunks.append((offset, "".join(map(six.text_type, fragments))))
+        self.chunks = []
+        write_chunks = getattr(self.options.out, "write_chunks", None)
+        if write_chunks is not None:
+            write_chunks(chunks)
+        else:
+            self.options.out.write("".join(text for _offset, text in chunks))
+        return chunks
 
     def write_comment(self, *objects):
         """Write *objects* as comments to stream."""
@@ -710,6 +1321,7 @@ class ReSTTranslator(TranslatorAPI):
 
     INDENT = "    "
     LINE_COMMENT = (".. ", "")
+    RENDER_OPTIONS = ("id_prefix", "markup", "highlight", "no_header", "man_sect")
 
     HIGHLIGHT_MAP = [
         # the regexpr are partial *overlapping*, mind the order!
@@ -730,8 +1342,10 @@ class ReSTTranslator(TranslatorAPI):
     ]
 
     MASK_REST_INLINES = [
-        (RE(r"(\w)_([\s\*])"), r"\1\\_\2"),  # trailing underline
-        (RE(r"([\s\*])_(\w)"), r"\1\\_\2"),  # leading underline
+        # lookarounds: the substitutes must not contain the text which is
+        # matched by the next rules (see HighlightMap)
+        (RE(r"(?<=\w)_(?=[\s\*])"), r"\\_"),  # trailing underline
+        (RE(r"(?<![^\s\*])_(?=\w)(?!_[\s\*])"), r"\\_"),  # leading underline
         (RE(r"(\*)"), r"\\\1"),  # emphasis
         (RE(r"(`)"), r"\\\1"),  # interpreted text & inline literals
         (RE(r"(\|)"), r"\\\1"),  # substitution references
@@ -740,13 +1354,45 @@ class ReSTTranslator(TranslatorAPI):
     FUNC_PTR = RE(r"([^\(]*\(\*)\s*\)\s*\(([^\)]*)\)")
     BITFIELD = RE(r"^(.*?)\s*(:.*)")
 
+    # line boundaries of str.splitlines() beside the newline
+    LINE_BREAKS = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
     def highlight(self, text):
+        return HIGHLIGHT_CACHE.lookup(
+            (self.__class__, self.options.markup, text), self._highlight, text
+        )
+
+    def _highlight(self, text):
         if self.options.markup == "kernel-doc":
             text = highlight_parser(text, self.MASK_REST_INLINES + self.HIGHLIGHT_MAP)
         elif self.options.markup == "reST":
             text = highlight_parser(text, self.HIGHLIGHT_MAP)
         return text
 
+    def highlight_lines(self, content):
+        """returns the formatted (:py:obj:`format_block`) and highlighted
+        content as a list of lines.
+
+        Same as ``highlight(format_block(content)).split("\\n")``, but the rows
+        are formatted and highlighted in one pass.
+        """
+        markup = self.options.markup
+        if markup == "kernel-doc":
+            strip, map_table = str.strip, self.MASK_REST_INLINES + self.HIGHLIGHT_MAP
+        elif markup == "reST":
+            strip, map_table = str.rstrip, self.HIGHLIGHT_MAP
+        else:
+            return self.highlight(self.format_block(content)).split("\n")
+        if self.LINE_BREAKS.search(content):
+            # str.splitlines() in highlight_parser splits the formatted rows
+            return self.highlight(self.format_block(content)).split("\n")
+        rows = [strip(row) for row in content.split("\n")]
+        if not rows[-1]:
+            # the formatted block ends with a newline, str.splitlines() in
+            # highlight_parser drops the last (empty) row
+            rows.pop()
+        return highlight_rows(rows, map_table) or [""]
+
     def format_block(self, content):
         """format the content (string)"""
         lines = []
@@ -756,6 +1402,39 @@ class ReSTTranslator(TranslatorAPI):
             lines = [l.rstrip() for l in content.split("\n")]
         return "\n".join(lines)
 
+    def highlight_block(self, content):
+        """returns the formatted (:py:obj:`format_block`) and highlighted
+        content (string)"""
+        return HIGHLIGHT_CACHE.lookup(
+            (self.__class__, self.options.markup, "block", content),
+            self._highlight_block,
+            content,
+        )
+
+    def _highlight_block(self, content):
+        return "\n".join(self.highlight_lines(content))
+
+    def format_lines(self, content, indent, prefix=""):
+        """returns the highlighted (:py:obj:`highlight_lines`) and dedented
+        content as an indented block: each line starts with a newline and the
+        *prefix*, non blank lines are indented by *indent*."""
+        return HIGHLIGHT_CACHE.lookup(
+            (self.__class__, self.options.markup, "lines", indent, prefix, content),
+            self._format_lines,
+            content,
+            indent,
+            prefix,
+        )
+
+    def _format_lines(self, content, indent, prefix):
+        return self.indent_lines(
+            dedent_lines(self._highlight_block(content).split("\n")), indent, prefix
+        )
+
+    def indent_lines(self, lines, indent, prefix=""):
+        nl = "\n" + prefix
+        return "".join([nl + indent + l if l.strip() else nl for l in lines])
+
     def write_anchor(self, refname):
         ID = refname
         if self.options.id_prefix:
@@ -787,14 +1466,12 @@ class ReSTTranslator(TranslatorAPI):
             self.write_header(header, sec_level=sec_level)
         if header.lower() == "example":
             self.write("\n.. code-block:: c\n\n")
-            for l in textwrap.dedent(content).split("\n"):
-                if not l.strip():
-                    self.write("\n")
-                else:
-                    self.write(self.INDENT, l, "\n")
+            lines = dedent_lines(content.split("\n"))
+            self.write(
+                "".join([self.INDENT + l + "\n" if l.strip() else "\n" for l in lines])
+            )
         else:
-            content = self.format_block(content)
-            content = self.highlight(content)
+            content = self.highlight_block(content)
             self.write("\n" + content)
 
         self.write("\n")
@@ -803,26 +1480,19 @@ class ReSTTranslator(TranslatorAPI):
         term = normalize_ws(term)  # term has to be a "one-liner"
         term = self.highlight(term)
         if definition != Parser.undescribed:
-            definition = self.format_block(definition)
-            definition = self.highlight(definition)
-        self.write("\n", prefix, term)
-        for l in textwrap.dedent(definition).split("\n"):
-            self.write("\n", prefix)
-            if l.strip():
-                self.write(self.INDENT, l)
-        self.write("\n")
+            definition = self.format_lines(definition, self.INDENT, prefix)
+        else:
+            lines = dedent_lines(definition.split("\n"))
+            definition = self.indent_lines(lines, self.INDENT, prefix)
+        self.write("\n", prefix, term, definition, "\n")
 
     def write_func_param(self, param, param_type, descr):
         param = param.replace("*", r"\*")
-        self.write("\n", self.INDENT, param)
-
         if descr != Parser.undescribed:
-            descr = self.format_block(descr)
-            descr = self.highlight(descr)
-        for l in textwrap.dedent(descr).split("\n"):
-            self.write("\n")
-            if l.strip():
-                self.write(self.INDENT * 2, l)
+            descr = self.format_lines(descr, self.INDENT * 2)
+        else:
+            descr = self.indent_lines(dedent_lines(descr.split("\n")), self.INDENT * 2)
+        self.write("\n", self.INDENT, param, descr)
 
         if param_type:
             param_type = param_type.replace("*", r"\*")
@@ -1176,12 +1846,11 @@ class ReSTTranslator(TranslatorAPI):
 class ParseOptions(Container):
 
     # pylint: disable=too-many-instance-attributes
-    # pylint: disable=global-statement
 
     PARSE_OPTION_RE = r"^/\*+\s*parse-%s:\s*([a-zA-Z0-9_-]*?)\s*\*/+\s*$"
     PARSE_OPTIONS = [
         ("highlight", ["on", "off"], "setOnOff"),
-        ("INSPECT", ["on", "off"], "setINSPECT"),
+        ("INSPECT", ["on", "off"], "setOnOff"),
         ("markup", ["reST", "kernel-doc"], "setVal"),
         ("SNIP", [], "setVal"),
         ("SNAP", [], "snap"),
@@ -1230,6 +1899,7 @@ class ParseOptions(Container):
         self.exp_method = None
         self.exp_ids = []
         self.known_attrs = []
+        self.proto_attrs_re = None  # cache of get_proto_attrs_re()
 
         # epilog / preamble
 
@@ -1246,6 +1916,7 @@ class ParseOptions(Container):
         self.opt_filters = dict()
         self.markup = "reST"
         self.highlight = True  # switch highlighting on/off
+        self.INSPECT = False  # switch inspection on/off
         self.man_sect = (
             None  # insert ".. kernel-doc-man:" directive, section no self.man_sect
         )
@@ -1254,6 +1925,9 @@ class ParseOptions(Container):
         # SNIP / SNAP
         self.SNIP = None
 
+        # feed only the comment regions to the states (see Parser.scan_lines)
+        self.scan_comments = False
+
         # init options with arguments from caller
         super().__init__(self, *args, **kwargs)
 
@@ -1292,15 +1966,10 @@ class ParseOptions(Container):
 
     def add_filters(self, parse_options):
 
-        def setINSPECT(name, val):  # pylint: disable=unused-argument
-            global INSPECT
-            INSPECT = bool(val == "on")
-
         _actions = dict(
             setOnOff=lambda name, val: (name, bool(val == "on")),
             setVal=lambda name, val: (name, val),
             snap=lambda name, val: ("SNIP", ""),
-            setINSPECT=setINSPECT,
         )
 
         for option, val_list, action in parse_options:
@@ -1348,6 +2017,154 @@ class ParseOptions(Container):
         id_pattern = "|".join(["(?:" + name + ")" for name in self.exp_ids])
         return RE(proto_pattern % id_pattern, flags=re.M)
 
+    def get_proto_attrs_re(self):
+        """Returns the (cached) regular expression of the qualifiers and
+        attributes removed from a function prototype.
+
+        These are the :py:obj:`PROTO_QUALIFIERS`, the ``known_attrs`` and if
+        ``exp_method`` is ``attribute``, the ``exp_ids``.  The alternation of
+        all of them is compiled once and cached in ``proto_attrs_re``."""
+        attrs = tuple(PROTO_QUALIFIERS) + tuple(self.known_attrs)
+        if self.exp_method == "attribute":
+            attrs += tuple(self.exp_ids)
+        cached = self.proto_attrs_re
+        if cached is None or cached[0] != attrs:
+            id_pattern = "|".join(["(?:" + name + ")" for name in attrs])
+            cached = self.proto_attrs_re = (attrs, RE("(?:%s) +" % id_pattern))
+        return cached[1]
+
+
+class DumpStorage(list):
+    """The place, where type dumps are stored (see :py:obj:`Parser.output_decl`).
+
+    Each item is a tuple ``(name, out_type, opts, ctx, kwargs)``, with the
+    *kwargs* of the translator's ``output_<out_type>`` method.  The ``sections``
+    and ``parameterdescs`` in the *kwargs* are ordered dictionaries with an
+    additional ``offsets`` attribute.
+
+    To pass dump storages cheaply over process boundaries (e.g. as result from a
+    :py:obj:`multiprocessing.pool.Pool`), a dump storage is pickled in the flat
+    format of :py:obj:`DumpStorage.to_flat`.
+    """
+
+    # kwargs of the output methods with an ordered dictionary that has offsets
+    OFFSET_DICTS = ("sections", "parameterdescs")
+
+    def __reduce__(self):
+        return (self.__class__.from_flat, (self.to_flat(),))
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._index = None  # see get_index
+
+    # the methods changing the items clear the index
+
+    def __setitem__(self, key, value):
+        self._index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._index = None
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self._index = None
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self._index = None
+        return super().__imul__(other)
+
+    def append(self, item):
+        self._index = None
+        super().append(item)
+
+    def extend(self, items):
+        self._index = None
+        super().extend(items)
+
+    def insert(self, pos, item):
+        self._index = None
+        super().insert(pos, item)
+
+    def pop(self, *args):
+        self._index = None
+        return super().pop(*args)
+
+    def remove(self, item):
+        self._index = None
+        super().remove(item)
+
+    def clear(self):
+        self._index = None
+        super().clear()
+
+    def sort(self, **kwargs):
+        self._index = None
+        super().sort(**kwargs)
+
+    def reverse(self):
+        self._index = None
+        super().reverse()
+
+    def get_index(self):
+        """Returns the index ``{name: [pos, ...]}`` of the items by name.
+
+        The index is build once and cleared when the items are changed.
+        """
+        if self._index is None:
+            index = collections.defaultdict(list)
+            for pos, item in enumerate(self):
+                index[item[0]].append(pos)
+            self._index = dict(index)
+        return self._index
+
+    def get_positions(self, names):
+        """Returns the (ordered) positions of the items with one of the *names*.
+
+        Returns ``None`` if a name is used by more than one item (the caller
+        has to walk all items to report the names used several times).
+        """
+        index = self.get_index()
+        if len(index) != len(self):
+            return None
+        return sorted(index[name][0] for name in set(names) if name in index)
+
+    def to_flat(self):
+        """Returns the dump storage in a flat format of builtin types.
+
+        The ordered dictionaries in :py:attr:`OFFSET_DICTS` are flattened to a
+        pair of (plain) dictionaries ``(items, offsets)``.  Equal *opts* of the
+        items share the same dictionary, so they are pickled only once.
+        """
+        flat = []
+        opts_memo = {}
+        for name, out_type, opts, ctx, kwargs in self:
+            opts = opts_memo.setdefault(tuple(opts.items()), opts)
+            kwargs = dict(kwargs)
+            for key in self.OFFSET_DICTS:
+                val = kwargs.get(key)
+                if val is not None:
+                    kwargs[key] = (dict(val), getattr(val, "offsets", {}))
+            flat.append((name, out_type, opts, ctx, kwargs))
+        return flat
+
+    @classmethod
+    def from_flat(cls, flat):
+        """Returns a dump storage build from the *flat* format (see
+        :py:obj:`DumpStorage.to_flat`)."""
+        dump_storage = cls()
+        for name, out_type, opts, ctx, kwargs in flat:
+            for key in cls.OFFSET_DICTS:
+                val = kwargs.get(key)
+                if val is not None:
+                    items, offsets = val
+                    val = collections.OrderedDict(items)
+                    val.offsets = offsets
+                    kwargs[key] = val
+            dump_storage.append((name, out_type, dict(opts), ctx, kwargs))
+        return dump_storage
+
 
 class ParserContext(Container):
 
@@ -1357,9 +2174,24 @@ class ParserContext(Container):
         # dumps options which are variable from parsing source-code
         return dict(decl_offset=self.decl_offset)
 
+    def dumpResult(self):
+        # dumps the parse result, this is all a translation of the dump storage
+        # needs from the context (see Parser.parse_dump_storage)
+        return dict(
+            line_no=self.line_no,
+            dump_storage=self.dump_storage,
+            snippets=self.snippets,
+            exported_symbols=self.exported_symbols,
+            rendered={},
+        )
+
     def __init__(self, *args, **kwargs):
         self.line_no = 0
-        self.contents = ""
+
+        # self.contents: lines of the current section (see Parser.add_contents),
+        # self.has_contents: one of the lines is not blank
+        self.contents = []
+        self.has_contents = False
         self.section = Parser.section_default
 
         # self.sections: ordered dictionary (list) of sections as they appear in
@@ -1368,6 +2200,9 @@ class ParserContext(Container):
         self.sectcheck = []
 
         self.prototype = ""
+        # self.prototype_parts: fragments of the prototype, the fragments are
+        # joined to self.prototype when the prototype is complete.
+        self.prototype_parts = []
         self.last_identifier = ""
 
         # self.parameterlist: ordered list of the parameters as they appear in
@@ -1409,7 +2244,11 @@ class ParserContext(Container):
         self.snippets = collections.OrderedDict()
 
         # the place, where type dumps are stored
-        self.dump_storage = []
+        self.dump_storage = DumpStorage()
+
+        # cache of the rendered declarations (see Parser.translate_decl), None
+        # means: don't cache
+        self.rendered = None
 
         # memo line numbers
         self.offset = 0
@@ -1508,6 +2347,13 @@ class Parser(SimpleLog):
     def __init__(self, options, translator):
         super().__init__()
 
+        # The parser does not depend on module globals which might be changed
+        # while parsing, all state is hold by the instance.  This allows to run
+        # parsers concurrently in threads.
+        self.log_verbose = VERBOSE
+        self.log_debug = DEBUG
+        self.log_out = STREAM.log_out
+
         # raw data akku
         self.rawdata = ""
 
@@ -1639,11 +2485,11 @@ class Parser(SimpleLog):
             with openTextFile(
                 self.options.fname, encoding=self.options.encoding
             ) as srcFile:
-                for line in srcFile:
-                    self.feed(line)
+                self.feed(srcFile.read())
         self.dump_suffix()
         self.dump_epilog()
         self.translator.eof()
+        self.translator.flush()
 
     def parse_dump_storage(self, translator=None, options=None):
         if options is not None:
@@ -1652,13 +2498,38 @@ class Parser(SimpleLog):
             self.setTranslator(translator)
         self.dump_preamble()
         self.dump_prefix()
-        for name, out_type, opts, ctx, kwargs in self.ctx.dump_storage:
-            self.options.update(opts)
-            self.ctx.update(ctx)
-            self.output_decl(name, out_type, **kwargs)
+        dump_storage = self.ctx.dump_storage
+        positions = None
+        if (
+            self.options.use_names
+            and not self.options.use_all_docs
+            and not self.translator.dumped_names
+            and isinstance(dump_storage, DumpStorage)
+        ):
+            # only the declarations in use_names are translated
+            positions = dump_storage.get_positions(self.options.use_names)
+        if positions is None:
+            for name, out_type, opts, ctx, kwargs in dump_storage:
+                self.options.update(opts)
+                self.ctx.update(ctx)
+                self.output_decl(name, out_type, **kwargs)
+        else:
+            for pos in positions:
+                name, out_type, opts, ctx, kwargs = dump_storage[pos]
+                self.options.update(opts)
+                self.ctx.update(ctx)
+                self.output_decl(name, out_type, **kwargs)
+            if dump_storage and positions[-1:] != [len(dump_storage) - 1]:
+                # leave options and context as if all declarations were dumped
+                _name, _out_type, opts, ctx, _kwargs = dump_storage[-1]
+                self.options.update(opts)
+                self.ctx.update(ctx)
+                self.ctx.offset = self.ctx.decl_offset
+            self.translator.dumped_names = list(dump_storage.get_index())
         self.dump_suffix()
         self.dump_epilog()
         self.translator.eof()
+        self.translator.flush()
 
     def close(self):  # end parsing
         self.feed("", eof=True)
@@ -1685,8 +2556,7 @@ class Parser(SimpleLog):
                 warnings=self.warnings,
             )
             self.warnings -= 1
-        global INSPECT  # pylint: disable=global-statement
-        INSPECT = False
+        self.options.INSPECT = False
 
     def feed(self, data, eof=False):
         self.rawdata = self.rawdata + data
@@ -1701,29 +2571,52 @@ class Parser(SimpleLog):
             else:
                 self.gather_context(self.rawdata, self.ctx, self.options)
 
-        lines = self.rawdata.split("\n")
+        data = self.rawdata
+        lines = data.split("\n")
 
         if not eof:
             # keep last line, until EOF
             self.rawdata = lines[-1]
             lines = lines[:-1]
 
+        # dispatch table of the states (indexed by self.state)
+        states = (
+            self.state_0,
+            self.state_1,
+            self.state_2,
+            self.state_3,
+            self.state_4,
+            self.state_5,
+        )
+        options = self.options
+        filter_opt = options.filter_opt
+        tab_width = options.tab_width
+
+        if options.scan_comments:
+            lines = self.scan_lines(data, lines)
+
         for l in lines:
-            l = l.expandtabs(self.options.tab_width)
-            self.ctx.line_no += 1
-            l = self.options.filter_opt(l, self)
+            ctx = self.ctx  # the states replace the context (see reset_state)
+            ctx.line_no += 1
+            l = filter_opt(l, self)
             if l is None:
                 continue
 
-            if self.options.SNIP:
+            state = self.state
+            snip = options.SNIP
+            if "\t" in l and (state or snip):
+                # Tabs are expanded in comments, prototypes and snippets, normal
+                # code (state 0) is only scanned for the start of a comment.
+                l = l.expandtabs(tab_width)
+
+            if snip:
                 # record snippet
-                val = self.ctx.snippets.get(self.options.SNIP, "")
+                val = ctx.snippets.get(snip, "")
                 if val or l:
-                    self.ctx.snippets[self.options.SNIP] = val + l + "\n"
+                    ctx.snippets[snip] = val + l + "\n"
 
-            state = getattr(self, "state_%s" % self.state)
             try:
-                state(l)
+                states[state](l)
             except Exception as _exc:
                 self.warn(
                     "total errors: %(errors)s / warnings: %(warnings)s",
@@ -1734,6 +2627,30 @@ class Parser(SimpleLog):
                 self.error("unhandled exception in line: %(l)s", l=l)
                 raise
 
+    def scan_lines(self, data, lines):
+        """Generator of the *lines* which have to go through the states.
+
+        In state 0 (normal code) and while no snippet is recorded, only a line
+        starting with ``/*`` (a kernel-doc comment or a parse-option) is of
+        interest.  The lines up to the next such line are skipped, only the line
+        number is counted.  Comments, prototypes and snippets are yielded line by
+        line.
+        """
+        count = len(lines)
+        starts = comment_starts(data)
+        start = -1  # index of the next line starting with "/*"
+        pos = 0
+        while pos < count:
+            if self.state == 0 and not self.options.SNIP:
+                while start < pos:
+                    start = min(next(starts, count), count)
+                self.ctx.line_no += start - pos
+                pos = start
+                if pos == count:
+                    break
+            yield lines[pos]
+            pos += 1
+
     def output_decl(self, name, out_type, **kwargs):
         self.ctx.offset = self.ctx.decl_offset
 
@@ -1764,15 +2681,47 @@ class Parser(SimpleLog):
             do_translate = True
         if do_translate:
             self.translator.translated_names.add(name)
-            out_func = getattr(self.translator, "output_%s" % out_type)
-            out_func(**kwargs)
+            self.translate_decl(name, out_type, **kwargs)
         else:
             self.debug("skip translation of %(t)s: '%(n)s'", t=out_type, n=name)
 
+    def translate_decl(self, name, out_type, **kwargs):
+        """Translate declaration *name* of type *out_type*.
+
+        If the context has a cache for rendered declarations (``ctx.rendered``)
+        and the output of the translator depends only on its
+        :py:attr:`RENDER_OPTIONS <TranslatorAPI.RENDER_OPTIONS>`, the output is
+        taken from the cache.  Declarations where the translation logs errors or
+        warnings are not cached.
+        """
+        key = None
+        render_options = self.translator.RENDER_OPTIONS
+        if self.ctx.rendered is not None and render_options is not None:
+            key = (
+                name,
+                out_type,
+                self.ctx.decl_offset,
+                self.translator.__class__,
+            ) + tuple(getattr(self.options, opt) for opt in render_options)
+            chunks = self.ctx.rendered.get(key)
+            if chunks is not None:
+                for offset, text in chunks:
+                    self.translator.write(text, offset=offset)
+                self.translator.flush()
+                return
+
+        self.translator.flush()
+        logged = self.errors + self.warnings
+        out_func = getattr(self.translator, "output_%s" % out_type)
+        out_func(**kwargs)
+        chunks = self.translator.flush()
+        if key is not None and logged == self.errors + self.warnings:
+            self.ctx.rendered[key] = chunks
+
     def state_0(self, line):
         """state: 0 - normal code"""
 
-        if doc_start.match(line):
+        if line[:3] == "/**" and not line[3:].strip():  # doc_start
             self.debug("START: kernel-doc comment / switch state 0 --> 1")
             self.ctx.decl_offset = self.ctx.line_no + 1
             self.state = 1
@@ -1785,7 +2734,7 @@ class Parser(SimpleLog):
             self.debug("START: DOC block / switch state 1 --> 4")
             self.ctx.last_offset = self.ctx.line_no + 1
             self.state = 4
-            self.ctx.contents = ""
+            self.set_contents()
             self.ctx.section = self.section_intro
             if doc_block[0].strip():
                 self.ctx.section = self.sect_title(doc_block[0])
@@ -1852,43 +2801,35 @@ class Parser(SimpleLog):
     def state_2(self, line):
         """state: 2 - scanning field start."""
 
+        markup = self.options.markup
+        kind, value, extra = classify_doc_line(line, markup)
         new_sect = ""
         new_cont = ""
 
-        if not doc_sect_except.match(line):
-
-            # probe different sect start pattern ...
-
-            if self.options.markup == "reST":
-                if doc_sect_reST.match(line):
-                    # this is a line with a parameter definition or vintage
-                    # section "Context: lorem", "Return: lorem" etc.
-                    new_sect = self.sect_title(doc_sect_reST[0].strip())
-                    new_cont = doc_sect_reST[1].strip()
-                elif reST_sect.match(line):
-                    # this is a line with a section definition "Section name:\n"
-                    new_sect = self.sect_title(reST_sect[0].strip())
-                    new_cont = ""
-
-                # Sub-sections in parameter descriptions are not provided,
-                # with the exception of special_sections names. To allow
-                # comments like:
-                #   * @arg: lorem
-                #   * Return: foo
-                if (
-                    new_sect
-                    and self.ctx.section.startswith("@")
-                    and not new_sect.startswith("@")
-                    and not new_sect in self.special_sections
-                ):
-                    new_sect = ""
-                    new_cont = ""
+        if kind == "sect":
+            # this is a line with a parameter definition, a section definition
+            # "Section name:\n" or a vintage section "Context: lorem",
+            # "Return: lorem" etc.
+            new_sect = self.sect_title(value.strip())
+            new_cont = extra.strip()
+
+            # Sub-sections in parameter descriptions are not provided, with the
+            # exception of special_sections names (reST markup). To allow
+            # comments like:
+            #   * @arg: lorem
+            #   * Return: foo
+            if (
+                markup == "reST"
+                and new_sect
+                and self.ctx.section.startswith("@")
+                and not new_sect.startswith("@")
+                and not new_sect in self.special_sections
+            ):
+                new_sect = ""
+                new_cont = ""
 
-            else:  # kernel-doc vintage mode
-                if doc_sect.match(line):
-                    # this is a line with a parameter or section definition
-                    new_sect = self.sect_title(doc_sect[0].strip())
-                    new_cont = doc_sect[1].strip()
+            if not new_sect:
+                kind, value, extra = classify_doc_line(line, markup, sections=False)
 
         if new_sect:
 
@@ -1896,14 +2837,13 @@ class Parser(SimpleLog):
 
             self.debug("found new section --> %(sect)s", sect=new_sect)
 
-            if self.ctx.contents.strip():
+            if self.ctx.has_contents:
+                contents = self.get_contents()
                 if not self.in_doc_sect:
-                    self.warn(
-                        "contents before sections '%(c)s'", c=self.ctx.contents.strip()
-                    )
-                self.dump_section(self.ctx.section, self.ctx.contents)
+                    self.warn("contents before sections '%(c)s'", c=contents.strip())
+                self.dump_section(self.ctx.section, contents)
                 self.ctx.section = self.section_default
-                self.ctx.contents = ""
+                self.set_contents()
 
             self.debug(
                 "new_sect: '%(sec)s' / desc: '%(desc)s'", sec=new_sect, desc=new_cont
@@ -1920,33 +2860,34 @@ class Parser(SimpleLog):
 
             self.ctx.section = new_sect
             if new_cont:
-                self.ctx.contents = new_cont + "\n"
+                self.set_contents(new_cont + "\n")
             self.info("section: %(sec)s", sec=self.ctx.section)
 
-        elif doc_end.search(line):
+        elif kind == "end":
 
             # end of the comment-block
 
             if self.ctx.contents:
-                self.dump_section(self.ctx.section, self.ctx.contents)
+                self.dump_section(self.ctx.section, self.get_contents())
                 self.ctx.section = self.section_default
-                self.ctx.contents = ""
+                self.set_contents()
 
             # look for doc_com + <text> + doc_end:
             if RE(doc_com.pattern + r"[a-zA-Z_0-9:\.]+" + doc_end.pattern).match(line):
                 self.warn("suspicious ending line")
 
             self.ctx.prototype = ""
+            self.ctx.prototype_parts = []
             self.debug("END doc block / switch state 2 --> 3")
             self.debug("end of doc comment, looking for prototype")
             self.state = 3
             self.brcount = 0
 
-        elif doc_content.match(line):
+        elif kind == "content":
 
             # a comment line with *content* of a section or a *purpose*
 
-            cont_line = doc_content[0]
+            cont_line = value
 
             if not cont_line.strip():
                 # it's a empty line
@@ -1959,16 +2900,17 @@ class Parser(SimpleLog):
                     self.debug(
                         "found empty line in *purpose* --> start 'Description' section"
                     )
-                    if self.ctx.contents.strip():
+                    if self.ctx.has_contents:
+                        contents = self.get_contents()
                         if not self.in_doc_sect:
                             self.warn(
                                 "contents before sections '%(c)s'",
-                                c=self.ctx.contents.strip(),
+                                c=contents.strip(),
                             )
-                        self.dump_section(self.ctx.section, self.ctx.contents)
+                        self.dump_section(self.ctx.section, contents)
 
                     self.ctx.section = self.section_descr
-                    self.ctx.contents = ""
+                    self.set_contents()
                     self.in_doc_sect = True
                     self.in_purpose = False
                     self.debug(
@@ -1988,10 +2930,10 @@ class Parser(SimpleLog):
                     self.debug(
                         "blank lines after @parameter --> start 'Description' section"
                     )
-                    self.dump_section(self.ctx.section, self.ctx.contents)
+                    self.dump_section(self.ctx.section, self.get_contents())
                     self.ctx.last_offset = self.ctx.line_no
                     self.ctx.section = self.section_descr
-                    self.ctx.contents = ""
+                    self.set_contents()
                     self.in_doc_sect = True
                     self.debug(
                         "FLAGs: in_doc_sect=%(s)s / in_purpose=%(p)s",
@@ -2000,7 +2942,7 @@ class Parser(SimpleLog):
                     )
 
                 else:
-                    self.ctx.contents += "\n"
+                    self.add_contents("\n")
 
             elif self.in_purpose:
                 # Continued declaration purpose, dismiss leading whitespace
@@ -2009,17 +2951,17 @@ class Parser(SimpleLog):
                 else:
                     self.ctx.decl_purpose = cont_line.strip()
             else:
-                if self.options.markup == "reST" and self.ctx.section.startswith("@"):
+                if markup == "reST" and self.ctx.section.startswith("@"):
                     # I doubt if it is a good idea to strip leading whitespaces
                     # in parameter description, but *over all* we get better
                     # reST output.
                     cont_line = cont_line.strip()
                     # Sub-sections in parameter descriptions are not provided,
                     # but if this is a "lorem:\n" line create a new paragraph.
-                    if reST_sect.match(line) and not doc_sect_except.match(line):
+                    if extra:
                         cont_line = "\n" + cont_line + "\n"
 
-                self.ctx.contents += cont_line + "\n"
+                self.add_contents(cont_line + "\n")
 
         else:
             # i dont know - bad line?  ignore.
@@ -2043,10 +2985,9 @@ class Parser(SimpleLog):
             cont = doc_state5_oneline[1].strip()
             if cont and sect:
                 self.ctx.section = self.sect_title(sect)
-                self.ctx.contents = cont
-                self.dump_section(self.ctx.section, self.ctx.contents)
+                self.dump_section(self.ctx.section, cont)
                 self.ctx.section = self.section_default
-                self.ctx.contents = ""
+                self.set_contents()
 
         elif doc_state5_start.match(line):
             self.debug("FLAG: split_doc_state=1 / switch state 3 --> 5")
@@ -2069,7 +3010,7 @@ class Parser(SimpleLog):
         if doc_block.match(line):
             # a new DOC block arrived, dump the last section and pass the new
             # DOC block to state 1.
-            self.dump_DOC(self.ctx.section, self.ctx.contents)
+            self.dump_DOC(self.ctx.section, self.get_contents())
             self.ctx = self.ctx.new()
             self.debug("END & START: DOC block / switch state 4 --> 1")
             self.state = 1
@@ -2078,7 +3019,7 @@ class Parser(SimpleLog):
         elif doc_end.match(line):
             # the DOC block ends here, dump it and reset to state 0
             self.debug("END: DOC block / dump doc section / switch state 4 --> 0")
-            self.dump_DOC(self.ctx.section, self.ctx.contents)
+            self.dump_DOC(self.ctx.section, self.get_contents())
             self.ctx = self.ctx.new()
             self.state = 0
 
@@ -2087,7 +3028,7 @@ class Parser(SimpleLog):
             if not cont.strip() and not self.ctx.contents:  # dismiss leading newlines
                 pass
             else:
-                self.ctx.contents += doc_content[0] + "\n"
+                self.add_contents(doc_content[0] + "\n")
 
     def state_5(self, line):
         """state: 5 - gathering documentation outside main block"""
@@ -2096,7 +3037,7 @@ class Parser(SimpleLog):
 
             # First line (split_doc_state 1) needs to be a @parameter
             self.ctx.section = self.sect_title(doc_state5_sect[0].strip())
-            self.ctx.contents = doc_state5_sect[1].strip() + "\n"
+            self.set_contents(doc_state5_sect[1].strip() + "\n")
             self.split_doc_state = 2
             self.debug(
                 "SPLIT-DOC-START: '%(param)s' / split-state 1 --> 2",
@@ -2109,13 +3050,13 @@ class Parser(SimpleLog):
             # Documentation block end
             self.debug("SPLIT-DOC-END: ...")
 
-            if not self.ctx.contents.strip():
+            if not self.ctx.has_contents:
                 self.debug("SPLIT-DOC-END: ... no description to dump")
 
             else:
-                self.dump_section(self.ctx.section, self.ctx.contents)
+                self.dump_section(self.ctx.section, self.get_contents())
                 self.ctx.section = self.section_default
-                self.ctx.contents = ""
+                self.set_contents()
 
             self.debug("SPLIT-DOC-END: ... split-state --> 0  / state = 3")
             self.state = 3
@@ -2124,7 +3065,7 @@ class Parser(SimpleLog):
         elif doc_content.match(line):
             # Regular text
             if self.split_doc_state == 2:
-                self.ctx.contents += doc_content[0] + "\n"
+                self.add_contents(doc_content[0] + "\n")
 
             elif self.split_doc_state == 1:
                 self.split_doc_state = 4
@@ -2144,19 +3085,18 @@ class Parser(SimpleLog):
             # is missed in the DOC string.
             self.ctx.decl_type = "macro"
 
-        stripProto = RE(r"([^\{]*)")
-
         if line.startswith("#") and self.ctx.decl_type != "macro":
             # do nothing
             pass
-        elif stripProto.match(line):
-            self.ctx.prototype += " " + stripProto[0]
+        else:
+            # strip function's body
+            self.ctx.prototype_parts.append(" " + line.partition("{")[0])
 
         if MACRO_define.search(line) or "{" in line or ";" in line:
 
             # strip cr&nl, strip C89 comments, strip leading whitespaces
             self.ctx.prototype = C89_comments.sub(
-                "", CR_NL.sub(" ", self.ctx.prototype)
+                "", CR_NL.sub(" ", "".join(self.ctx.prototype_parts))
             ).lstrip()
 
             if SYSCALL_DEFINE.search(self.ctx.prototype):
@@ -2247,55 +3187,59 @@ class Parser(SimpleLog):
             # later (drop-semicolon).
             line += ";"
 
-        m = RE(r"([^{};]*)([{};])(.*)")
-
-        while True:
-            if m.search(line):
-                if self.ctx.prototype:
-                    self.ctx.prototype += " "
-                self.ctx.prototype += m[0] + m[1]
-                if m[1] == "{":
-                    self.brcount += 1
-                if m[1] == "}":
-                    self.brcount -= 1
-                if m[1] == ";" and self.brcount == 0:
-                    self.info("prototype --> '%(proto)s'", proto=self.ctx.prototype)
-                    self.debug("decl_type: %(decl_type)s", decl_type=self.ctx.decl_type)
-                    if self.ctx.decl_type == "union":
-                        self.dump_union(self.ctx.prototype)
-                    elif self.ctx.decl_type == "struct":
-                        self.dump_struct(self.ctx.prototype)
-                    elif self.ctx.decl_type == "enum":
-                        self.dump_enum(self.ctx.prototype)
-                    elif self.ctx.decl_type == "typedef":
-                        self.dump_typedef(self.ctx.prototype)
-                    else:
-                        raise ParserBuggy(
-                            self, "unknown decl_type: %s" % self.ctx.decl_type
-                        )
+        parts = self.ctx.prototype_parts
+        pos = 0
+        for match in PROTO_DELIMITERS.finditer(line):
+            if parts:
+                parts.append(" ")
+            parts.append(line[pos : match.end()])
+            pos = match.end()
+            delimiter = match.group()
+            if delimiter == "{":
+                self.brcount += 1
+            elif delimiter == "}":
+                self.brcount -= 1
+            elif self.brcount == 0:
+                self.ctx.prototype = "".join(parts)
+                self.info("prototype --> '%(proto)s'", proto=self.ctx.prototype)
+                self.debug("decl_type: %(decl_type)s", decl_type=self.ctx.decl_type)
+                if self.ctx.decl_type == "union":
+                    self.dump_union(self.ctx.prototype)
+                elif self.ctx.decl_type == "struct":
+                    self.dump_struct(self.ctx.prototype)
+                elif self.ctx.decl_type == "enum":
+                    self.dump_enum(self.ctx.prototype)
+                elif self.ctx.decl_type == "typedef":
+                    self.dump_typedef(self.ctx.prototype)
+                else:
+                    raise ParserBuggy(
+                        self, "unknown decl_type: %s" % self.ctx.decl_type
+                    )
 
-                    self.reset_state()
-                    break
-                line = m[2]
-            else:
-                self.ctx.prototype += line
-                break
+                self.reset_state()
+                return
+        if pos < len(line):
+            parts.append(line[pos:])
 
     # dump objects
 
     def dump_preamble(self):
         if not self.options.skip_preamble:
             self.translator.output_preamble()
+            self.translator.flush()
 
     def dump_epilog(self):
         if not self.options.skip_epilog:
             self.translator.output_epilog()
+            self.translator.flush()
 
     def dump_prefix(self):
         self.translator.output_prefix()
+        self.translator.flush()
 
     def dump_suffix(self):
         self.translator.output_suffix()
+        self.translator.flush()
 
     def dump_section(self, name, cont):
         """Store section's *content* under it's name.
@@ -2357,26 +3301,10 @@ class Parser(SimpleLog):
     def dump_function(self, proto):
         self.debug("dump_function(): (1) '%(proto)s'", proto=proto)
         hasRetVal = True
-        proto = re.sub(r"^static +", "", proto)
-        proto = re.sub(r"^extern +", "", proto)
-        proto = re.sub(r"^asmlinkage +", "", proto)
-        proto = re.sub(r"^inline +", "", proto)
-        proto = re.sub(r"^__inline__ +", "", proto)
-        proto = re.sub(r"^__inline +", "", proto)
-        proto = re.sub(r"^__always_inline +", "", proto)
-        proto = re.sub(r"^noinline +", "", proto)
-        proto = re.sub(r"__init +", "", proto)
-        proto = re.sub(r"__init_or_module +", "", proto)
-        proto = re.sub(r"__meminit +", "", proto)
-        proto = re.sub(r"__must_check +", "", proto)
-        proto = re.sub(r"__weak +", "", proto)
-
-        # Remove known attributes from function prototype
-        known_attrs = self.options.known_attrs.copy()
-        if self.options.exp_method == "attribute":
-            known_attrs.extend(self.options.exp_ids)
-        for attr in known_attrs:
-            proto = re.sub(r"%s +" % attr, "", proto)
+        proto = PROTO_SPECIFIERS.sub("", proto, count=1)
+
+        # Remove qualifiers and known attributes from function prototype
+        proto = self.options.get_proto_attrs_re().sub("", proto)
 
         define = bool(MACRO_define.match(proto))
         proto = MACRO_define.sub("", proto)
@@ -2423,23 +3351,13 @@ class Parser(SimpleLog):
             hasRetVal = False
             self.debug("dump_function(): (hasRetVal = False) '%(proto)s'", proto=proto)
         else:
-            matchExpr = None
-            for regexp in FUNC_PROTOTYPES:
-                if regexp.match(proto):
-                    matchExpr = regexp
-                    self.debug(
-                        "dump_function(): matchExpr = '%(pattern)s' // '%(proto)s'",
-                        pattern=matchExpr.pattern,
-                        proto=proto,
-                    )
-                    break
-
-            if matchExpr is not None:
-                self.debug("dump_function(): return_type='%(x)s'", x=matchExpr[0])
-                self.ctx.return_type = matchExpr[0]
-                self.debug("dump_function(): decl_name='%(x)s'", x=matchExpr[1])
-                self.ctx.decl_name = matchExpr[1]
-                self.create_parameterlist(matchExpr[2], ",")
+            parts = split_prototype(proto)
+            if parts is not None:
+                self.debug("dump_function(): return_type='%(x)s'", x=parts[0])
+                self.ctx.return_type = parts[0]
+                self.debug("dump_function(): decl_name='%(x)s'", x=parts[1])
+                self.ctx.decl_name = parts[1]
+                self.create_parameterlist(parts[2], ",")
             else:
                 self.warn(
                     "can't understand function proto: '%(prototype)s'",
@@ -2477,6 +3395,22 @@ class Parser(SimpleLog):
             decl_type=self.ctx.decl_type,
         )
 
+    def add_contents(self, text):
+        """Add *text* (one or more lines) to the contents of the current
+        section."""
+        self.ctx.contents.append(text)
+        if not self.ctx.has_contents and not text.isspace():
+            self.ctx.has_contents = True
+
+    def set_contents(self, text=""):
+        """Replace the contents of the current section by *text*."""
+        self.ctx.contents = [text] if text else []
+        self.ctx.has_contents = bool(text) and not text.isspace()
+
+    def get_contents(self):
+        """Returns the contents of the current section (string)."""
+        return "".join(self.ctx.contents)
+
     def dump_DOC(self, name, cont):
         self.dump_section(name, cont)
         self.output_decl(name, "DOC", sections=self.ctx.sections)
@@ -2592,49 +3526,7 @@ class Parser(SimpleLog):
             )
 
             # Split nested struct/union elements as newer ones
-            NESTED = RE(r"(struct|union)([^{};]+){([^{}]*)}([^{}\;]*)\;")
-            while NESTED.search(members):
-                n_content = NESTED[2].strip()
-                n_type = NESTED[0].strip()
-                n_ids = NESTED[3].strip()
-                n_new = ""
-                # union car {int foo;} bar1, bar2, *bbar3;
-                for n_id in n_ids.split(","):
-                    n_id = re.sub(r"[:\[].*", "", n_id).strip()
-                    n_id = n_id.strip().replace("*", "")
-                    n_new += "%s %s;" % (NESTED[0].strip(), n_id)
-                    for arg in n_content.split(";"):
-                        arg = normalize_ws(arg)
-                        if not arg:
-                            continue
-                        # Handle arrays
-                        arg = re.sub(r"\[\s*\S.*\]", "", arg)
-
-                        PTR_TO_FUNC = RE(r"^([^\(]+\(\*?\s*)([\w\.]*)(\s*\).*)")
-                        if PTR_TO_FUNC.search(arg):
-                            n_type = PTR_TO_FUNC[0].strip()
-                            n_name = PTR_TO_FUNC[1].strip()
-                            n_extra = PTR_TO_FUNC[2].strip()
-                            if not n_name:
-                                continue
-                            if not n_id:
-                                n_new += "%s%s%s; " % (n_type, n_name, n_extra)
-                            else:
-                                n_new += "%s%s.%s%s; " % (n_type, n_id, n_name, n_extra)
-
-                        else:
-                            # suppport bit types e.g. '__u8 arg1 : 1' --> '__u8 arg1'
-                            arg = re.sub(r"\s*:\s*[0-9]+", "", arg)
-                            n_type = arg.split(" ")[0]
-                            n_name = arg.split(" ")[-1].replace("*", "")
-                            if n_name == n_type:
-                                # anonymous struct/union
-                                n_new += "%s;" % (n_type)
-                            elif not n_id:
-                                n_new += "%s %s;" % (n_type, n_name)
-                            else:
-                                n_new += "%s %s.%s;" % (n_type, n_id, n_name)
-                members = NESTED.sub(n_new, members, count=1)
+            members = self.flatten_nested(members)
 
             # ignore other nested elements, like enums
             members = re.sub(r"({[^\{\}]*})", "", members)
@@ -2652,6 +3544,125 @@ class Parser(SimpleLog):
 
         return retVal
 
+    def flatten_nested(self, members):
+        """Split nested struct/union elements of *members* as newer ones.
+
+        ``union car {int foo;} bar1, bar2;`` is replaced by ``union bar1;int
+        bar1.foo;union bar2;int bar2.foo;``.  The *members* are scanned once,
+        the inner elements are replaced before the outer ones.  Nested elements
+        which are not a struct/union (e.g. an enum) are left as they are, and so
+        are the elements around them."""
+        frames = []
+        pieces = []  # text of the current block
+        pending = []  # elements whose identifiers end at the "{" of the next one
+        seg = ""  # text of the current block behind the last "{", "}" or ";"
+        pos = 0
+        for match in re.finditer(r"[{};]", members):
+            i = match.start()
+            if i < pos:
+                # already consumed by the identifiers of a nested element
+                continue
+            text = members[pos:i]
+            char = members[i]
+            if char == "{":
+                seg += text
+                pieces.append(text)
+                head = NESTED_HEAD.search(seg)
+                head_len = len(seg) - head.start() if head else 0
+                frames.append((pieces, pending, head, head_len))
+                pieces, pending, seg = [], [], ""
+                pos = i + 1
+                continue
+            if char == ";" or not frames:
+                # end of a member or an unbalanced "}"
+                pieces.append(text + char)
+                seg = ""
+                pos = i + 1
+                continue
+
+            pieces.append(text)
+            content = "".join(pieces)
+            pieces, pending, head, head_len = frames.pop()
+            ids = NESTED_IDS.match(members, i + 1)
+            nested = head is not None and "{" not in content and "}" not in content
+            if not nested or ids.group(2) != ";":
+                if not nested or ids.group(2) != "{":
+                    pending = []
+                else:
+                    # the next element might end the identifiers
+                    pending.append((len(pieces) - 1, head, head_len, content))
+                pieces.append("{" + content + "}")
+                seg = ""
+                pos = i + 1
+                continue
+
+            n_new = self.nested_members(head.group(1), content, ids.group(1))
+            pieces[-1] = pieces[-1][: len(pieces[-1]) - head_len]
+            pieces.append(n_new)
+            pos = ids.end()
+            while pending:
+                # identifiers of the previous element end in this one
+                idx, head, head_len, content = pending.pop()
+                tail = "".join(pieces[idx + 2 :])
+                end = tail.index(";")
+                n_new = self.nested_members(head.group(1), content, tail[:end])
+                n_new += tail[end + 1 :]
+                pieces[idx] = pieces[idx][: len(pieces[idx]) - head_len]
+                pieces[idx + 1 :] = [n_new]
+            seg = n_new[n_new.rfind(";") + 1 :]
+
+        pieces.append(members[pos:])
+        while frames:
+            # unbalanced "{"
+            content = "".join(pieces)
+            pieces = frames.pop()[0]
+            pieces.append("{" + content)
+        return "".join(pieces)
+
+    def nested_members(self, n_type, n_content, n_ids):
+        """Returns the members of the nested struct/union *n_type* with the
+        *n_content* for each of its identifiers *n_ids* (see
+        :py:obj:`Parser.flatten_nested`)."""
+        n_type = n_type.strip()
+        n_content = n_content.strip()
+        n_ids = n_ids.strip()
+        n_new = ""
+        # union car {int foo;} bar1, bar2, *bbar3;
+        for n_id in n_ids.split(","):
+            n_id = re.sub(r"[:\[].*", "", n_id).strip()
+            n_id = n_id.strip().replace("*", "")
+            n_new += "%s %s;" % (n_type, n_id)
+            for arg in n_content.split(";"):
+                arg = normalize_ws(arg)
+                if not arg:
+                    continue
+                # Handle arrays
+                arg = re.sub(r"\[\s*\S.*\]", "", arg)
+                if NESTED_PTR_TO_FUNC.search(arg):
+                    a_type = NESTED_PTR_TO_FUNC[0].strip()
+                    a_name = NESTED_PTR_TO_FUNC[1].strip()
+                    a_extra = NESTED_PTR_TO_FUNC[2].strip()
+                    if not a_name:
+                        continue
+                    if not n_id:
+                        n_new += "%s%s%s; " % (a_type, a_name, a_extra)
+                    else:
+                        n_new += "%s%s.%s%s; " % (a_type, n_id, a_name, a_extra)
+
+                else:
+                    # suppport bit types e.g. '__u8 arg1 : 1' --> '__u8 arg1'
+                    arg = re.sub(r"\s*:\s*[0-9]+", "", arg)
+                    a_type = arg.split(" ")[0]
+                    a_name = arg.split(" ")[-1].replace("*", "")
+                    if a_name == a_type:
+                        # anonymous struct/union
+                        n_new += "%s;" % (a_type)
+                    elif not n_id:
+                        n_new += "%s %s;" % (a_type, a_name)
+                    else:
+                        n_new += "%s %s.%s;" % (a_type, n_id, a_name)
+        return n_new
+
     def dump_enum(self, proto):
         self.debug("dump_enum(): '%(proto)s'", proto=proto)
 
@@ -2804,17 +3815,18 @@ class Parser(SimpleLog):
         parameter = normalize_ws(parameter)
         pointer_to_func = RE(r"\(.+\)\s*\(")
 
-        # temporarily replace commas inside function pointer definition
-        m = RE(r"(\([^\),]+),")
-
-        while m.search(parameter):
-            parameter = m.sub(r"\1#", parameter)
         # drop trailing splitchar, if extists
         if parameter.endswith(splitchar):
             parameter = parameter[:-1]
 
         self.debug("create_parameterlist(): params='%(y)s'", y=parameter)
-        for c, p in enumerate(parameter.split(splitchar)):
+        if splitchar == ",":
+            # don't split at the commas inside function pointer definitions
+            parameters = split_toplevel(parameter, splitchar)
+        else:
+            parameters = parameter.split(splitchar)
+
+        for c, p in enumerate(parameters):
             p = C99_comments.sub("", p)
             p = p.strip()
 
@@ -2833,7 +3845,6 @@ class Parser(SimpleLog):
             elif pointer_to_func.search(p):
 
                 # pointer-to-function
-                p = p.replace("#", ",")  # reinsert temporarily removed commas
                 self.debug("  parameter#%(c)s: (pointer to function) %(p)s", c=c, p=p)
                 m = RE(r"[^\(]+\(\*?\s*([\w\.]*)\s*\)")
                 m.match(p)
@@ -2848,7 +3859,7 @@ class Parser(SimpleLog):
                 p = re.sub(r"\s*\[", "[", p)
                 self.debug("  parameter#%(c)s: (common) %(p)s", c=c, p=p)
 
-                p_args = re.split(r"\s*,\s*", p)
+                p_args = [arg.strip() for arg in split_toplevel(p, ",")]
                 if re.match(r"\s*,\s*", p_args[0]):
                     p_args[0] = re.sub(r"(\*+)\s*", r" \1", p_args[0])
 
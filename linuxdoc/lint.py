@@ -49,8 +49,15 @@ def main():
         sys.exit(42)
 
     if CMD.srctree.ISDIR:
-        for fname in CMD.srctree.reMatchFind(r"^.*\.[ch]$"):
-            lintdoc_file(fname)
+        if CMD.threads > 1:
+            # pylint: disable=consider-using-with
+            pool = kernel_doc.get_pool(CMD.threads, CMD.backend)
+            pool.map(lintdoc_file, CMD.srctree.reMatchFind(r"^.*\.[ch]$"))
+            pool.close()
+            pool.join()
+        else:
+            for fname in CMD.srctree.reMatchFind(r"^.*\.[ch]$"):
+                lintdoc_file(fname)
     else:
         fname = CMD.srctree
         CMD.srctree = CMD.srctree.DIRNAME
@@ -91,6 +98,18 @@ def get_cli():
         help="verbose output with log messages to stderr",
     )
     cli.add_argument("--debug", action="store_true", help="debug messages to stderr")
+    cli.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Lint the files of a folder with up to n threads.",
+    )
+    cli.add_argument(
+        "--backend",
+        choices=kernel_doc.POOL_BACKENDS,
+        default="auto",
+        help=kernel_doc.POOL_BACKEND_HELP,
+    )
     return cli
 
 
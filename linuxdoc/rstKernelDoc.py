@@ -15,7 +15,11 @@ linux kernel source code comments.
 # imports
 # ==============================================================================
 
+import functools
 import glob
+import hashlib
+import os
+import re
 from sphinx.util import logging
 from io import StringIO
 from os import path
@@ -26,6 +30,7 @@ from docutils.parsers.rst import Directive, directives
 from docutils.statemachine import ViewList
 from docutils.utils import SystemMessage
 from fspath import OS_ENV
+from sphinx import addnodes
 from sphinx.util.docutils import switch_source_input
 
 from . import kernel_doc as kerneldoc
@@ -38,13 +43,41 @@ __version__ = "3.0"
 
 
 class ParserCache:
-    """A simple (in process) cache for :py:obj:`KernelDocParser` objects (read
-    :py:obj:`PARSER_CACHE`)
-
+    """A simple (in process) LRU cache for parse results of the
+    :py:obj:`KernelDocParser` (read :py:obj:`PARSER_CACHE`).
+
+    The cache does not hold the parser objects, it holds the (compact) parse
+    result from :py:obj:`ParserContext.dumpResult()
+    <linuxdoc.kernel_doc.ParserContext.dumpResult>`: the dump storage, the
+    snippets and the exported symbols.  The translator, the options, the Sphinx
+    application and the raw data of the parser are not cached.
+
+    A cached parse result is only valid as long as the source file is
+    unchanged: the modification time and the size of the source file are
+    stored along with the result and if one of them has been changed, the
+    result is dropped from the cache.  With *use_hash* a changed stamp is
+    checked against a hash of the file content, a file that has only been
+    touched (e.g. by a checkout) does not invalidate the result.
+
+    :param maxsize: Maximal number of parse results in the cache, if the cache
+        is full, the least recently used result is dropped.  ``None`` (default)
+        means, the cache is unbounded.
+
+    :param use_hash: Additional validate parse results against a hash of the
+        file content (default ``False``).
     """
 
-    def __init__(self):
-        self._cache = {}
+    def __init__(self, maxsize=None, use_hash=False):
+        self.use_hash = use_hash
+        self._cache = kerneldoc.LRUCache(maxsize)
+
+    @property
+    def maxsize(self):
+        return self._cache.maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        self._cache.maxsize = maxsize
 
     def get_id(self, opts):
         """Generate a cache ID from the options of the kernel-doc directive.  Some of
@@ -59,12 +92,56 @@ class ParserCache:
             tuple(opts.known_attrs),
         )
 
+    def get_stamp(self, fname, with_hash=None):
+        """Returns a stamp ``(mtime, size, hash)`` of file *fname*.  The *hash*
+        is ``None`` if neither *with_hash* nor :py:attr:`use_hash` is set.
+
+        To not miss a modification of the source file while it is parsed, the
+        stamp has to be taken *before* the file is parsed (see
+        :py:obj:`KernelDoc.parseSource`).
+        """
+        if with_hash is None:
+            with_hash = self.use_hash
+        stat = os.stat(fname)
+        digest = None
+        if with_hash:
+            with open(fname, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        return (stat.st_mtime_ns, stat.st_size, digest)
+
     def get(self, opts):
         x = self.get_id(opts)
-        return self._cache.get(x)
+        entry = self._cache.get(x)
+        if entry is None:
+            return None
 
-    def set(self, opts, parser):
-        self._cache[self.get_id(opts)] = parser
+        stamp, result = entry
+        try:
+            current = self.get_stamp(opts.fname, with_hash=False)
+        except OSError:
+            current = None
+
+        if current is None or current[:2] != stamp[:2]:
+            if current is None or stamp[2] is None:
+                self._cache.pop(x)
+                return None
+            current = self.get_stamp(opts.fname, with_hash=True)
+            if current[2] != stamp[2]:
+                self._cache.pop(x)
+                return None
+            # file was touched, but its content is unchanged
+            self._cache.set(x, (current, result))
+
+        return result
+
+    def set(self, opts, result, stamp=None):
+        x = self.get_id(opts)
+        if stamp is None:
+            stamp = self.get_stamp(opts.fname)
+        self._cache.set(x, (stamp, result))
+
+    def clear(self):
+        self._cache.clear()
 
 
 PARSER_CACHE = ParserCache()
@@ -73,8 +150,43 @@ paralell build (job option -j N) where builds are spanned over processes.
 Sphinx-build creates a new job (process) not for each kernel-doc directive but
 for each rest-file (that contains at least one kernel-doc directive).
 
+The size of the cache can be limited by the ``kernel_doc_cache_size`` option in
+the sphinx config, the validation of cached parse results by a hash of the
+source file is activated by the ``kernel_doc_cache_hash`` option.
+
 """
 
+
+NODES_CACHE = kerneldoc.LRUCache()
+"""The (in process) cache of the doctree nodes of kernel-doc directives, by
+default the cache is off.  The size of the cache is set by the
+``kernel_doc_nodes_cache_size`` option in the sphinx config.
+
+Identical kernel-doc directives (e.g. the same ``:doc:`` section included in
+several reST files) generate the same reST content and parsing this content
+again results in the same nodes.  The cache holds a pristine copy of the nodes,
+the :py:obj:`KernelDoc` directive returns a deep copy of them (see
+:py:obj:`KernelDoc.nestedParse`).
+
+Only nodes without side effects on the build environment are cached: nodes of
+domain objects (e.g. ``.. c:function::``), footnotes, citations, substitutions,
+pending nodes and nodes with IDs but without a name are never cached, neither are the
+nodes of a content that has been reported (warnings, errors) by docutils.
+
+"""
+
+UNCACHEABLE_NODES = (
+    addnodes.desc,
+    nodes.pending,
+    nodes.system_message,
+    nodes.footnote,
+    nodes.footnote_reference,
+    nodes.citation,
+    nodes.citation_reference,
+    nodes.substitution_definition,
+    nodes.substitution_reference,
+)
+
 app_log = logging.getLogger("application")
 
 
@@ -88,11 +200,188 @@ def setup(app):
     app.add_config_value("kernel_doc_exp_ids", None, "env")
     app.add_config_value("kernel_doc_known_attrs", None, "env")
     app.add_config_value("kernel_doc_srctree", kerneldoc.SRCTREE, "env")
+    app.add_config_value("kernel_doc_cache_size", None, "env")
+    app.add_config_value("kernel_doc_cache_hash", False, "env")
+    app.add_config_value("kernel_doc_parse_threads", "auto", "env", types=(str, int))
+    app.add_config_value(
+        "kernel_doc_highlight_cache_size", 0, "env", types=(int, type(None))
+    )
+    app.add_config_value(
+        "kernel_doc_nodes_cache_size", 0, "env", types=(int, type(None))
+    )
+    app.add_config_value("kernel_doc_scan_comments", False, "env")
     app.add_directive("kernel-doc", KernelDoc)
+    app.connect("builder-inited", init_caches)
+    app.connect("env-before-read-docs", preparse_sources)
+    app.connect("build-finished", log_caches)
 
     return dict(version=__version__, parallel_read_safe=True, parallel_write_safe=True)
 
 
+def get_parse_options(config, current_source, argument, options):
+    """Returns the :py:obj:`ParseOptions <linuxdoc.kernel_doc.ParseOptions>` of
+    a kernel-doc directive with the *argument* and the *options* in the reST
+    file *current_source*."""
+
+    fname = argument
+    src_tree = path.dirname(path.normpath(current_source))
+    exp_method = options.get("exp-method", config.kernel_doc_exp_method)
+    exp_ids = options.get("exp-ids", config.kernel_doc_exp_ids)
+    known_attrs = options.get("known-attrs", config.kernel_doc_known_attrs)
+
+    if argument.startswith("/"):
+        # Absolute path names are relative to srctree, which is taken from
+        # environment, configuration or current directory (in this order).
+        fname = argument[1:]
+        src_tree = OS_ENV.get("srctree", config.kernel_doc_srctree)
+
+    return kerneldoc.ParseOptions(
+        fname=fname,
+        src_tree=src_tree,
+        id_prefix=options.get("module", "").strip(),
+        encoding=options.get("encoding", config.source_encoding),
+        verbose_warn=config.kernel_doc_verbose_warn,
+        markup=config.kernel_doc_mode,
+        man_sect=options.get("man-sect", None),
+        exp_method=exp_method,
+        exp_ids=(exp_ids or "").replace(",", " ").split(),
+        known_attrs=(known_attrs or "").replace(",", " ").split(),
+        scan_comments=config.kernel_doc_scan_comments,
+    )
+
+
+def get_caches(config):
+    """Yields the ``(name, unit, cache, maxsize)`` of the caches, which are off by
+    default: the :py:obj:`HIGHLIGHT_CACHE <linuxdoc.kernel_doc.HIGHLIGHT_CACHE>`
+    and the :py:obj:`NODES_CACHE`."""
+    yield (
+        "highlight",
+        "fragments",
+        kerneldoc.HIGHLIGHT_CACHE,
+        config.kernel_doc_highlight_cache_size,
+    )
+    yield "nodes", "node lists", NODES_CACHE, config.kernel_doc_nodes_cache_size
+
+
+def init_caches(app):
+    """Clear the caches and set their size from ``kernel_doc_highlight_cache_size``
+    and ``kernel_doc_nodes_cache_size``.  The parse results in the
+    :py:obj:`PARSER_CACHE` are kept, they are validated against the source files,
+    its size and validation are set from ``kernel_doc_cache_size`` and
+    ``kernel_doc_cache_hash``."""
+    for _name, _unit, cache, maxsize in get_caches(app.config):
+        cache.clear()
+        cache.maxsize = maxsize
+    PARSER_CACHE.maxsize = app.config.kernel_doc_cache_size
+    PARSER_CACHE.use_hash = app.config.kernel_doc_cache_hash
+
+
+def log_caches(app, exception):  # pylint: disable=unused-argument
+    """Log the hit rate of the caches, which are on."""
+    for name, unit, cache, _maxsize in get_caches(app.config):
+        if cache.maxsize == 0:
+            continue
+        stats = cache.stats()
+        stats.update(name=name, unit=unit, hit_rate=stats["hit_rate"] * 100)
+        app_log.verbose(
+            "kernel-doc %(name)s cache: %(hits)d hits, %(misses)d misses"
+            " (hit rate %(hit_rate).1f%%), %(size)d %(unit)s" % stats
+        )
+
+
+KERNEL_DOC_DIRECTIVE = re.compile(r"^\s*\.\.\s+kernel-doc::\s+(.*?)\s*$")
+KERNEL_DOC_OPTION = re.compile(r"^\s+:([\w-]+):\s*(.*?)\s*$")
+
+
+def grep_parse_options(config, fname):
+    """Greps the ``kernel-doc`` directives from the reST file *fname* and yield
+    the :py:obj:`ParseOptions <linuxdoc.kernel_doc.ParseOptions>` of the source
+    files refered by these directives."""
+
+    try:
+        lines = kerneldoc.readFile(fname, encoding=config.source_encoding).splitlines()
+    except (OSError, UnicodeError):
+        return
+
+    for i, line in enumerate(lines):
+        m = KERNEL_DOC_DIRECTIVE.match(line)
+        if not m:
+            continue
+        argument = m.group(1)
+        options = {}
+        try:
+            for opt_line in lines[i + 1 :]:
+                opt = KERNEL_DOC_OPTION.match(opt_line)
+                if not opt:
+                    break
+                # convert the value like the directive does (an empty value is
+                # passed as None, see docutils.utils.extract_options)
+                convert = KernelDoc.option_spec[opt.group(1)]
+                options[opt.group(1)] = convert(opt.group(2) or None)
+        except (LookupError, ValueError, TypeError):
+            # the kernel-doc directive will report the faulty option
+            continue
+
+        opts = get_parse_options(config, fname, argument, options)
+        opts.set_defaults()
+        if path.exists(opts.fname):
+            yield opts
+
+
+def preparse_sources(app, env, docnames):
+    """Parse the source files refered by the kernel-doc directives in *docnames*
+    in a thread pool and store the parse results in the :py:obj:`PARSER_CACHE`.
+
+    The number of threads is set by ``kernel_doc_parse_threads``, with ``auto``
+    the source files are parsed in advance only on a free-threaded (no-GIL)
+    Python interpreter (see :py:obj:`is_free_threaded
+    <linuxdoc.kernel_doc.is_free_threaded>`).
+
+    If the size of the :py:obj:`PARSER_CACHE` is limited, the source files are
+    not parsed in advance: the results would be dropped from the cache before
+    the directives read them and the files would be parsed twice.
+    """
+    threads = app.config.kernel_doc_parse_threads
+    if threads == "auto":
+        threads = (os.cpu_count() or 1) if kerneldoc.is_free_threaded() else 0
+    if not int(threads) or PARSER_CACHE.maxsize is not None:
+        return
+
+    jobs = {}
+    for docname in docnames:
+        for opts in grep_parse_options(app.config, str(env.doc2path(docname))):
+            x = PARSER_CACHE.get_id(opts)
+            if x not in jobs and PARSER_CACHE.get(opts) is None:
+                jobs[x] = opts
+    if not jobs:
+        return
+
+    with kerneldoc.get_pool(int(threads), "thread") as pool:
+        results = pool.map(functools.partial(preparse_source, app), jobs.values())
+
+    # the messages of the workers are logged from the main thread
+    for opts, result, stamp, messages in filter(None, results):
+        for level, message in messages:
+            getattr(app_log, level)(message)
+        PARSER_CACHE.set(opts, result, stamp)
+
+
+def preparse_source(app, opts):
+    """Parse the source file of the :py:obj:`ParseOptions
+    <linuxdoc.kernel_doc.ParseOptions>` *opts* (worker of
+    :py:obj:`preparse_sources`).  Returns the parse result with its stamp and
+    the collected log messages or ``None`` if the parser fails."""
+    try:
+        stamp = PARSER_CACHE.get_stamp(opts.fname)
+        parser = KernelDocParser(app, opts, kerneldoc.NullTranslator())
+        parser.messages = []
+        parser.parse()
+    except Exception:  # pylint: disable=broad-except
+        # the kernel-doc directive will parse the file again and report
+        return None
+    return opts, parser.ctx.dumpResult(), stamp, parser.messages
+
+
 class KernelDocParser(kerneldoc.Parser):
 
     # pylint: disable=deprecated-method
@@ -100,6 +389,15 @@ class KernelDocParser(kerneldoc.Parser):
     def __init__(self, app, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.app = app
+        self.messages = None  # if a list, collect (level, message) tuples
+
+    def log(self, level, message):
+        """Log *message* with the sphinx logger, or collect it in
+        ``self.messages`` (see :py:obj:`preparse_sources`)."""
+        if self.messages is None:
+            getattr(app_log, level)(message)
+        else:
+            self.messages.append((level, message))
 
     # -------------------------------------------------
     # bind the parser logging to the sphinx application
@@ -112,20 +410,20 @@ class KernelDocParser(kerneldoc.Parser):
         replace["line_no"] = replace.get("line_no", self.ctx.line_no)
         self.errors += 1
         message = ("%(fname)s:%(line_no)s: [kernel-doc ERROR] : " + message) % replace
-        app_log.error(message)
+        self.log("error", message)
 
     def warn(self, message, **replace):
         replace["fname"] = self.options.fname
         replace["line_no"] = replace.get("line_no", self.ctx.line_no)
         self.warnings += 1
         message = ("%(fname)s:%(line_no)s: [kernel-doc WARN] : " + message) % replace
-        app_log.warning(message)
+        self.log("warning", message)
 
     def info(self, message, **replace):
         replace["fname"] = self.options.fname
         replace["line_no"] = replace.get("line_no", self.ctx.line_no)
         message = ("%(fname)s:%(line_no)s: [kernel-doc INFO] : " + message) % replace
-        app_log.info(message)
+        self.log("info", message)
 
     def debug(self, message, **replace):
         if self.app.verbosity < 2:
@@ -133,7 +431,7 @@ class KernelDocParser(kerneldoc.Parser):
         replace["fname"] = self.options.fname
         replace["line_no"] = replace.get("line_no", self.ctx.line_no)
         message = ("%(fname)s:%(line_no)s: [kernel-doc DEBUG] : " + message) % replace
-        app_log.debug(message)
+        self.log("debug", message)
 
 
 class FaultyOption(Exception):
@@ -177,22 +475,7 @@ class KernelDoc(Directive):
         self,
     ):  # pylint: disable=too-many-branches, too-many-statements
 
-        fname = self.arguments[0]
-        src_tree = path.dirname(path.normpath(self.doc.current_source))
         exp_files = []  # file pattern to search for EXPORT_SYMBOL
-        exp_method = self.options.get(
-            "exp-method", self.env.config.kernel_doc_exp_method
-        )
-        exp_ids = self.options.get("exp-ids", self.env.config.kernel_doc_exp_ids)
-        known_attrs = self.options.get(
-            "known-attrs", self.env.config.kernel_doc_known_attrs
-        )
-
-        if self.arguments[0].startswith("/"):
-            # Absolute path names are relative to srctree, which is taken from
-            # environment, configuration or current directory (in this order).
-            fname = self.arguments[0][1:]
-            src_tree = OS_ENV.get("srctree", self.env.config.kernel_doc_srctree)
 
         if "internal" in self.options and "export" in self.options:
             raise FaultyOption(
@@ -218,17 +501,8 @@ class KernelDoc(Directive):
         # set parse adjustments
 
         ctx = kerneldoc.ParserContext()
-        opts = kerneldoc.ParseOptions(
-            fname=fname,
-            src_tree=src_tree,
-            id_prefix=self.options.get("module", "").strip(),
-            encoding=self.options.get("encoding", self.env.config.source_encoding),
-            verbose_warn=self.env.config.kernel_doc_verbose_warn,
-            markup=self.env.config.kernel_doc_mode,
-            man_sect=self.options.get("man-sect", None),
-            exp_method=exp_method,
-            exp_ids=(exp_ids or "").replace(",", " ").split(),
-            known_attrs=(known_attrs or "").replace(",", " ").split(),
+        opts = get_parse_options(
+            self.env.config, self.doc.current_source, self.arguments[0], self.options
         )
 
         if "doc" not in self.options and opts.man_sect is None:
@@ -333,16 +607,17 @@ class KernelDoc(Directive):
         self.state_machine.insert_input(todo.split("\n"), self.arguments[0])
 
     def parseSource(self, opts):
-        parser = PARSER_CACHE.get(opts)
+        result = PARSER_CACHE.get(opts)
+        parser = KernelDocParser(self.env.app, opts, kerneldoc.NullTranslator())
 
-        if parser is None:
-            self.env.note_dependency(opts.fname)  # ??
+        self.env.note_dependency(opts.fname)
+        if result is None:
             # app_log.info("parse kernel-doc comments from: %s" % opts.fname)
-            parser = KernelDocParser(self.env.app, opts, kerneldoc.NullTranslator())
+            stamp = PARSER_CACHE.get_stamp(opts.fname)
             parser.parse()
-            PARSER_CACHE.set(opts, parser)
-        else:
-            parser.setOptions(opts)
+            result = parser.ctx.dumpResult()
+            PARSER_CACHE.set(opts, result, stamp)
+        parser.ctx.update(result)
 
         return parser
 
@@ -460,9 +735,30 @@ class KernelDoc(Directive):
             for l in lines.split("\n"):
                 content.append(l, reSTfname, self.lineno)
 
+        return self.nestedParse(content)
+
+    def nestedParse(self, content):
+        """Parse the reST *content* and return the nodes.  If the
+        :py:obj:`NODES_CACHE` is on, the nodes of an identical content are
+        taken from the cache."""
+
+        key = entry = None
+        if NODES_CACHE.maxsize != 0:
+            key = self.getNodesKey(content)
+            entry = NODES_CACHE.get(key)
+        if entry is not None:
+            children = self.replayNodes(entry)
+            if children is not None:
+                return children
+
         node = nodes.section()
         # necessary so that the child nodes get the right source/line set
         node.document = self.state.document
+        messages = []
+        deps = None
+        if key is not None:
+            deps = set(self.env.dependencies.get(self.env.docname, ()))
+            self.state.document.reporter.attach_observer(messages.append)
         with switch_source_input(self.state, content):
             # hack around title style bookkeeping
             buf = self.state.memo.title_styles, self.state.memo.section_level
@@ -471,8 +767,88 @@ class KernelDoc(Directive):
                 self.state.nested_parse(content, 0, node, match_titles=1)
             finally:
                 self.state.memo.title_styles, self.state.memo.section_level = buf
+                if key is not None:
+                    self.state.document.reporter.detach_observer(messages.append)
+
+        if key is not None and entry is None and not messages:
+            entry = self.getNodesEntry(node.children, deps)
+            if entry is not None:
+                NODES_CACHE.set(key, entry)
         return node.children
 
+    def getNodesKey(self, content):
+        """Returns the key of *content* in the :py:obj:`NODES_CACHE`.  Beside the
+        lines and their origin, the nodes depend on the directive options, the
+        reference context (e.g. the current C namespace) and the default role."""
+
+        digest = hashlib.sha256()
+        for line, item in zip(content.data, content.items):
+            digest.update(("%s\0%r\0" % (line, item)).encode("utf-8", "replace"))
+        cur_doc = getattr(self.env, "current_document", None)
+        if cur_doc is None:  # older Sphinx versions
+            cur_doc = self.env.temp_data
+        return (
+            digest.hexdigest(),
+            repr(sorted(self.options.items())),
+            repr(sorted(self.env.ref_context.items())),
+            cur_doc.get("default_role"),
+        )
+
+    def getNodesEntry(self, children, deps):
+        """Returns the cache entry ``(children, targets, deps)`` of the parsed
+        *children* or ``None`` if the nodes have side effects that can't be
+        replayed (see :py:obj:`NODES_CACHE`).
+
+        The *targets* are the explicit flags of the named nodes, *deps* are the
+        dependencies the nested parse has added to the current document.
+        """
+        doc = self.state.document
+        targets = []
+        for child in children:
+            for n in child.findall(nodes.Element):
+                if isinstance(n, UNCACHEABLE_NODES) or n.get("anonymous"):
+                    return None
+                if n["dupnames"] or (n["ids"] and not n["names"]):
+                    return None
+                if n["names"]:
+                    targets.append(doc.nametypes.get(n["names"][0], False))
+        deps = set(self.env.dependencies.get(self.env.docname, ())) - deps
+        return [c.deepcopy() for c in children], targets, deps
+
+    def replayNodes(self, entry):
+        """Returns a deep copy of the cached nodes with the targets registered
+        in the current document.  The IDs of the targets are generated again,
+        in the same order as docutils does when parsing the content.  Returns
+        ``None`` if a name of the cached nodes is already used in the current
+        document, in this case the content has to be parsed again (docutils
+        reports the duplicate names)."""
+        doc = self.state.document
+        children, targets, deps = entry
+        children = [c.deepcopy() for c in children]
+        elements = [n for c in children for n in c.findall(nodes.Element)]
+        for n in elements:
+            if any(name in doc.nameids for name in n["names"]):
+                return None
+
+        targets = iter(targets)
+        for n in elements:
+            if "refdoc" in n:
+                n["refdoc"] = self.env.docname
+            if n["names"]:
+                n["ids"] = []
+                if next(targets):
+                    doc.note_explicit_target(n)
+                else:
+                    doc.note_implicit_target(n)
+            if "refname" in n:
+                if isinstance(n, nodes.target):
+                    doc.note_indirect_target(n)
+                else:
+                    doc.note_refname(n)
+        for dep in deps:
+            self.env.note_dependency(dep)
+        return children
+
 
 class WriterList(ViewList):
     """docutils ViewList with write method."""
@@ -482,17 +858,26 @@ class WriterList(ViewList):
         self.parser = parser
 
         self.last_offset = -1
-        self.line_buffer = ""
+        self.line_buffer = []
 
     def write(self, cont):
         if self.last_offset != self.parser.ctx.offset:
             self.flush()
-            self.line_buffer = ""
             self.last_offset = self.parser.ctx.offset
 
-        self.line_buffer += cont
+        self.line_buffer.append(cont)
+
+    def write_chunks(self, chunks):
+        """Write ``(offset, text)`` chunks (see :py:obj:`TranslatorAPI.flush
+        <linuxdoc.kernel_doc.TranslatorAPI.flush>`)."""
+        for offset, cont in chunks:
+            if self.last_offset != offset:
+                self.flush()
+                self.last_offset = offset
+            self.line_buffer.append(cont)
 
     def flush(self):
-        for _i, l in enumerate(self.line_buffer.split("\n")):
-            self.append(l, self.parser.options.fname, self.last_offset)
-        self.line_buffer = ""
+        lines = "".join(self.line_buffer).split("\n")
+        source = (self.parser.options.fname, self.last_offset)
+        self.extend(ViewList(lines, items=[source] * len(lines)))
+        self.line_buffer = []
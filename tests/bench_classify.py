@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+bench_classify
+~~~~~~~~~~~~~~
+
+Benchmark of :py:obj:`classify_doc_line <linuxdoc.kernel_doc.classify_doc_line>`
+on the comment lines of the kernel-doc examples, compared with the regular
+expressions of :py:obj:`classify_doc_line_re
+<linuxdoc.kernel_doc.classify_doc_line_re>`::
+
+    $ python -m tests.bench_classify
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import functools
+import timeit
+
+from linuxdoc import kernel_doc
+
+from . import howto
+
+REPEAT = 50
+
+
+def comment_lines():
+    """The comment lines (state 2) of the examples, repeated REPEAT times."""
+    lines = []
+    for fname in howto.SOURCES:
+        for line in (howto.HOWTO / fname).read_text(encoding="utf-8").split("\n"):
+            if line.lstrip().startswith("*"):
+                lines.append(line.expandtabs(8))
+    return lines * REPEAT
+
+
+def classify(func, lines, markup):
+    for line in lines:
+        func(line, markup)
+
+
+def best(func, *args):
+    """Best time of three calls of *func* with the *args*."""
+    return min(timeit.repeat(functools.partial(func, *args), number=1, repeat=3))
+
+
+def main():
+    lines = comment_lines()
+    print("%d comment lines      markup       regexp ns/line  str ns/line" % len(lines))
+    for markup in howto.MARKUPS:
+        t_re = best(classify, kernel_doc.classify_doc_line_re, lines, markup)
+        t_str = best(classify, kernel_doc.classify_doc_line, lines, markup)
+        print(
+            "                         %-10s %12.0f %12.0f"
+            % (markup, t_re / len(lines) * 1e9, t_str / len(lines) * 1e9)
+        )
+
+
+if __name__ == "__main__":
+    main()
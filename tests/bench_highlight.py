@@ -0,0 +1,152 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+bench_highlight
+~~~~~~~~~~~~~~~
+
+Benchmark of :py:obj:`highlight_parser <linuxdoc.kernel_doc.highlight_parser>`
+on big DOC blocks, compared with the former loop that pops the rows from the
+front of the row list::
+
+    $ python -m tests.bench_highlight
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import functools
+import io
+import timeit
+
+from linuxdoc import kernel_doc
+
+MAP_TABLES = {
+    "reST": kernel_doc.ReSTTranslator.HIGHLIGHT_MAP,
+    "kernel-doc": (
+        kernel_doc.ReSTTranslator.MASK_REST_INLINES
+        + kernel_doc.ReSTTranslator.HIGHLIGHT_MAP
+    ),
+}
+
+
+def highlight_parser_pop(text, map_table):
+    """The former highlight_parser: rows are popped from the front of the row
+    list and pushed back by ``insert(0, row)``."""
+    hmap = kernel_doc.get_highlight_map(map_table)
+    rst_indent = kernel_doc.RST_INDENT
+    literal_block = kernel_doc.RST_LITERAL_BLOCK
+    code_block = kernel_doc.RST_CODE_BLOCK
+    block_indent = 0
+    row_indent = 0
+    state = "highlight"  # [highlight|literal]
+    out = []
+    in_rows = text.splitlines()
+
+    while in_rows:
+        row = in_rows.pop(0)
+
+        if not row.strip():  # pass-through empty lines & continue
+            out.append(row)
+            continue
+
+        rst_indent.search(row)
+        indent = len(rst_indent[0].expandtabs())
+
+        if state == "highlight":
+            out.append(hmap.map_row(row))
+            # prepare next state
+            if literal_block.search(row) or code_block.search(row):
+                state = "literal"
+                block_indent = row_indent + 1
+            continue
+
+        if indent < block_indent:
+            # this is a new block, push row back onto the stack and repeat
+            # the loop
+            state = "highlight"
+            block_indent = indent
+            in_rows.insert(0, row)
+            continue
+
+        out.append(row)
+
+    return "\n".join(out)
+
+
+def doc_block(lines):
+    """A DOC block of *lines* rows with text, references and literal blocks."""
+    rows = []
+    for i in range(lines):
+        if i % 10 == 5:
+            rows.append("Example %d::" % i)
+        elif i % 10 in (6, 7):
+            rows.append("    foo(&bar, %d);" % i)
+        else:
+            rows.append("Lorem @arg %d calls foo() with &struct bar and %%CONST." % i)
+    return "\n".join(rows)
+
+
+def literal_blocks(lines):
+    """Rows of literal blocks, each literal row is pushed back by the former
+    loop."""
+    rows = []
+    for i in range(lines // 3):
+        rows += ["Block %d::" % i, "    literal %d" % i, "next %d" % i]
+    return "\n".join(rows)
+
+
+def doc_source(lines):
+    """A C source with a DOC comment of *lines* rows."""
+    rows = ["/**", " * DOC: big doc", " *"]
+    rows += [(" * " + row).rstrip() for row in doc_block(lines).splitlines()]
+    rows += [" */", ""]
+    return "\n".join(rows)
+
+
+def best(func, *args):
+    """Best time of three calls of *func* with the *args*."""
+    return min(timeit.repeat(functools.partial(func, *args), number=1, repeat=3))
+
+
+def bench_highlight_parser():
+    cases = [
+        ("DOC block, 5000 rows", doc_block(5000)),
+        ("DOC block, 20000 rows", doc_block(20000)),
+        ("literal blocks, 51000 rows", literal_blocks(51000)),
+    ]
+    print("highlight_parser                     markup       pop(0) loop    linear")
+    for label, text in cases:
+        for markup, map_table in MAP_TABLES.items():
+            result = kernel_doc.highlight_parser(text, map_table)
+            assert highlight_parser_pop(text, map_table) == result
+            t_pop = best(highlight_parser_pop, text, map_table)
+            t_new = best(kernel_doc.highlight_parser, text, map_table)
+            print("  %-34s %-10s %9.3fs %9.3fs" % (label, markup, t_pop, t_new))
+
+
+def translate(src, markup):
+    """Returns the reST of the C source *src*."""
+    out = io.StringIO()
+    opts = kernel_doc.ParseOptions(
+        fname="big-doc.c", markup=markup, use_all_docs=True, out=out
+    )
+    opts.set_defaults()
+    parser = kernel_doc.Parser(opts, kernel_doc.ReSTTranslator())
+    parser.parse([src])
+    parser.close()
+    return out.getvalue()
+
+
+def bench_translate():
+    print("parse & translate (ReSTTranslator)   markup        time")
+    kernel_doc.STREAM.log_out = kernel_doc.DevNull
+    for lines in (5000, 20000):
+        src = doc_source(lines)
+        for markup in MAP_TABLES:
+            label = "DOC comment, %d rows" % lines
+            t = best(translate, src, markup)
+            print("  %-34s %-10s %9.3fs" % (label, markup, t))
+
+
+if __name__ == "__main__":
+    bench_highlight_parser()
+    bench_translate()
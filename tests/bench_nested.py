@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+bench_nested
+~~~~~~~~~~~~
+
+Benchmark of :py:obj:`Parser.flatten_nested
+<linuxdoc.kernel_doc.Parser.flatten_nested>` on deeply nested structs,
+compared with the former loop (see :py:obj:`tests.test_nested`)::
+
+    $ python -m tests.bench_nested
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import functools
+import timeit
+
+from linuxdoc import kernel_doc
+
+from .test_nested import flatten_nested_loop
+
+
+def anonymous_unions(count, depth):
+    """Members with *count* anonymous unions, each nested *depth* levels."""
+    inner = "int a; void (*cb)(int x, long y); unsigned long flags : 3;"
+    for d in range(depth):
+        inner = "union { struct { %s } s%d; u64 raw%d; }; " % (inner, d, d)
+    return " ".join("int m%d; %s" % (i, inner) for i in range(count))
+
+
+def best(func, *args):
+    """Best time of three calls of *func* with the *args*."""
+    return min(timeit.repeat(functools.partial(func, *args), number=1, repeat=3))
+
+
+def main():
+    opts = kernel_doc.ParseOptions(fname="nested.h")
+    opts.set_defaults()
+    parser = kernel_doc.Parser(opts, kernel_doc.NullTranslator())
+    cases = [
+        ("200 anonymous unions, depth 2", anonymous_unions(200, 2)),
+        ("400 anonymous unions, depth 2", anonymous_unions(400, 2)),
+        ("50 anonymous unions, depth 6", anonymous_unions(50, 6)),
+    ]
+    print("members                          former loop  flatten_nested")
+    for label, members in cases:
+        assert parser.flatten_nested(members) == flatten_nested_loop(members)
+        t_loop = best(flatten_nested_loop, members)
+        t_new = best(parser.flatten_nested, members)
+        print("  %-32s %9.3fs %9.3fs" % (label, t_loop, t_new))
+
+
+if __name__ == "__main__":
+    main()
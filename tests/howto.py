@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+howto
+~~~~~
+
+The kernel-doc examples in ``docs/linuxdoc-howto`` and their golden reST
+output in ``tests/golden``.  To update the golden files run::
+
+    $ python -m tests.howto
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import io
+import pathlib
+
+from linuxdoc import kernel_doc
+
+HOWTO = pathlib.Path(__file__).parent.parent / "docs" / "linuxdoc-howto"
+GOLDEN = pathlib.Path(__file__).parent / "golden"
+
+SOURCES = sorted(p.name for p in HOWTO.glob("*.[ch]"))
+MARKUPS = ["reST", "kernel-doc"]
+
+
+def get_options(fname, markup, **kwargs):
+    """Returns the :py:obj:`ParseOptions <linuxdoc.kernel_doc.ParseOptions>`
+    of the example *fname* (like ``linuxdoc.rest`` uses them)."""
+    kwargs.setdefault("use_all_docs", True)
+    opts = kernel_doc.ParseOptions(fname=fname, src_tree=HOWTO, markup=markup, **kwargs)
+    opts.set_defaults()
+    return opts
+
+
+def parse(fname, markup, translator=None, **kwargs):
+    """Parse the example *fname* and return the parser."""
+    opts = get_options(fname, markup, **kwargs)
+    if translator is None:
+        translator = kernel_doc.ReSTTranslator()
+    log_out = kernel_doc.STREAM.log_out
+    kernel_doc.STREAM.log_out = kernel_doc.DevNull
+    try:
+        parser = kernel_doc.Parser(opts, translator)
+        parser.parse()
+        parser.close()
+    finally:
+        kernel_doc.STREAM.log_out = log_out
+    return parser
+
+
+def translate(fname, markup, **kwargs):
+    """Returns the reST of the example *fname*."""
+    out = io.StringIO()
+    parse(fname, markup, out=out, **kwargs)
+    return out.getvalue()
+
+
+def golden_file(fname, markup):
+    return GOLDEN / ("%s.%s.rst" % (fname, markup))
+
+
+def update_golden():
+    GOLDEN.mkdir(exist_ok=True)
+    for fname in SOURCES:
+        for markup in MARKUPS:
+            golden_file(fname, markup).write_text(
+                translate(fname, markup), encoding="utf-8"
+            )
+
+
+if __name__ == "__main__":
+    update_golden()
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_classify
+~~~~~~~~~~~~~
+
+Differential test of :py:obj:`classify_doc_line
+<linuxdoc.kernel_doc.classify_doc_line>` against the regular expressions of
+:py:obj:`classify_doc_line_re <linuxdoc.kernel_doc.classify_doc_line_re>`.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import random
+
+import pytest
+
+from linuxdoc import kernel_doc
+
+from . import howto
+
+FUZZ_SEED = 50
+FUZZ_COUNT = 50000
+FUZZ_CHARS = [
+    " ",
+    "*",
+    "/",
+    "@",
+    ":",
+    ".",
+    "_",
+    "a",
+    "Z",
+    "1",
+    "\t",
+    "-",
+    "x",
+    "ſ",
+    "ı",
+    "K",
+    "\xe9",
+    "\xb2",
+    "\x0b",
+    "\r",
+]
+FUZZ_WORDS = [
+    "Return",
+    "returns",
+    "NOTE",
+    "intro",
+    "introduction",
+    "Description",
+    "contexts",
+    "@...",
+    "@foo",
+    "http://",
+    "@a.b",
+    "Examples",
+    "examplE",
+    "ſ",
+]
+
+
+def howto_lines():
+    """The lines of the examples, the tabs expanded like the parser does."""
+    lines = set()
+    for fname in howto.SOURCES:
+        for line in (howto.HOWTO / fname).read_text(encoding="utf-8").split("\n"):
+            lines.add(line.expandtabs(8))
+    return sorted(lines)
+
+
+def fuzz_lines(seed=FUZZ_SEED, count=FUZZ_COUNT):
+    """Random lines of FUZZ_CHARS and FUZZ_WORDS."""
+    rnd = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        line = ""
+        for _ in range(rnd.randint(0, 8)):
+            if rnd.random() < 0.3:
+                line += rnd.choice(FUZZ_WORDS)
+            else:
+                line += "".join(
+                    rnd.choice(FUZZ_CHARS) for _ in range(rnd.randint(1, 4))
+                )
+        lines.append(line)
+    return lines
+
+
+def mismatches(lines, markup, sections):
+    return [
+        line
+        for line in lines
+        if kernel_doc.classify_doc_line(line, markup, sections)
+        != kernel_doc.classify_doc_line_re(line, markup, sections)
+    ]
+
+
+@pytest.mark.parametrize("sections", [True, False])
+@pytest.mark.parametrize("markup", howto.MARKUPS)
+def test_howto(markup, sections):
+    assert not mismatches(howto_lines(), markup, sections)
+
+
+@pytest.fixture(name="fuzz", scope="module")
+def fixture_fuzz():
+    return fuzz_lines()
+
+
+@pytest.mark.parametrize("sections", [True, False])
+@pytest.mark.parametrize("markup", howto.MARKUPS)
+def test_fuzz(fuzz, markup, sections):
+    assert not mismatches(fuzz, markup, sections)
+
+
+@pytest.mark.parametrize(
+    "line, result",
+    [
+        (" * @foo: lorem ", ("sect", "@foo", " lorem")),
+        (" * @...: more", ("sect", "@...", " more")),
+        (" * Return: 0 on success", ("sect", "Return", " 0 on success")),
+        (" * see http://example.org", ("content", "see http://example.org", False)),
+        (" * Lorem ipsum:", ("sect", "Lorem ipsum", "")),
+        (" *" + " " * 8 + "Note: 8", ("sect", "Note", " 8")),
+        (" *" + " " * 9 + "Note: 9", ("content", " " * 8 + "Note: 9", False)),
+        (" */", ("end", None, None)),
+        (" lorem", (None, None, None)),
+    ],
+)
+def test_classify(line, result):
+    assert kernel_doc.classify_doc_line(line) == result
@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_dedent
+~~~~~~~~~~~
+
+Differential test of :py:obj:`dedent_lines <linuxdoc.kernel_doc.dedent_lines>`
+against :py:obj:`textwrap.dedent` and the caching of the formatted lines
+(:py:obj:`ReSTTranslator.format_lines
+<linuxdoc.kernel_doc.ReSTTranslator.format_lines>`).
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import random
+import textwrap
+
+import pytest
+
+from linuxdoc import kernel_doc
+
+from . import howto
+
+FUZZ_SEED = 40
+FUZZ_COUNT = 100000
+FUZZ_CHARS = [" ", "  ", "\t", " \t", "a", "b c", "*"]
+
+
+def fuzz_lines(rnd):
+    """Up to six random lines of FUZZ_CHARS."""
+    return [
+        "".join(rnd.choice(FUZZ_CHARS) for _ in range(rnd.randint(0, 6)))
+        for _ in range(rnd.randint(1, 6))
+    ]
+
+
+def dedent_lines_textwrap(lines):
+    return textwrap.dedent("\n".join(lines)).split("\n")
+
+
+def test_fuzz():
+    rnd = random.Random(FUZZ_SEED)
+    mismatches = []
+    for _ in range(FUZZ_COUNT):
+        lines = fuzz_lines(rnd)
+        if kernel_doc.dedent_lines(lines) != dedent_lines_textwrap(lines):
+            mismatches.append(lines)
+    assert not mismatches
+
+
+@pytest.mark.parametrize(
+    "lines, result",
+    [
+        (["  a", "    b", "  c"], ["a", "  b", "c"]),
+        (["\ta", "\t  b"], ["a", "  b"]),
+        (["  a", " \t", "  b"], ["a", "", "b"]),
+        ([" a", "\tb"], [" a", "\tb"]),
+        (["", "  a"], ["", "a"]),
+        (["  "], [""]),
+    ],
+)
+def test_dedent_lines(lines, result):
+    assert kernel_doc.dedent_lines(lines) == result
+    assert dedent_lines_textwrap(lines) == result
+
+
+def test_format_lines_cache(monkeypatch):
+    """The formatted lines take one entry in the HIGHLIGHT_CACHE, the
+    highlighted block of the lines is not cached for its own."""
+    cache = kernel_doc.LRUCache(maxsize=None)
+    monkeypatch.setattr(kernel_doc, "HIGHLIGHT_CACHE", cache)
+    translator = kernel_doc.ReSTTranslator()
+    translator.setOptions(howto.get_options("all-in-a-tumble.h", "reST"))
+    content = "    lorem @ipsum\n      dolor"
+    lines = translator.format_lines(content, "    ")
+    assert cache.stats()["size"] == 1
+    assert translator.format_lines(content, "    ") == lines
+    assert cache.stats()["hits"] == 1
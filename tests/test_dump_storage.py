@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_dump_storage
+~~~~~~~~~~~~~~~~~
+
+Tests of the :py:obj:`DumpStorage <linuxdoc.kernel_doc.DumpStorage>` index, its
+flat pickle format and the selective :py:obj:`Parser.parse_dump_storage
+<linuxdoc.kernel_doc.Parser.parse_dump_storage>`.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import io
+import pickle
+
+import pytest
+
+from linuxdoc import kernel_doc
+
+from . import howto
+
+FNAME = "all-in-a-tumble.h"
+
+
+def item(name):
+    return (name, "function_decl", {}, {}, {})
+
+
+def test_index():
+    storage = kernel_doc.DumpStorage([item("a"), item("b")])
+    assert storage.get_index() == {"a": [0], "b": [1]}
+    assert storage.get_index() is storage.get_index()
+
+    storage[1] = item("c")
+    assert storage.get_index() == {"a": [0], "c": [1]}
+    storage.append(item("a"))
+    assert storage.get_index() == {"a": [0, 2], "c": [1]}
+    assert storage.get_positions(["a"]) is None
+    del storage[0]
+    assert storage.get_index() == {"c": [0], "a": [1]}
+    storage.reverse()
+    assert storage.get_index() == {"a": [0], "c": [1]}
+    storage += [item("d")]
+    assert storage.get_positions(["d", "a", "x"]) == [0, 2]
+    storage.clear()
+    assert storage.get_index() == {}
+
+
+def test_pickle():
+    storage = kernel_doc.DumpStorage([item("a"), item("b")])
+    storage.get_index()
+    storage = pickle.loads(pickle.dumps(storage))
+    storage[0] = item("c")
+    assert storage.get_index() == {"c": [0], "b": [1]}
+
+
+def round_trip(storage):
+    """Pickle the *storage* and compare the copy, returns the number of
+    offsets."""
+    copy = pickle.loads(pickle.dumps(storage))
+    assert isinstance(copy, kernel_doc.DumpStorage)
+    assert copy == storage
+    offsets = 0
+    for orig, dump in zip(storage, copy):
+        for key in kernel_doc.DumpStorage.OFFSET_DICTS:
+            if key in orig[4]:
+                val, copy_val = orig[4][key], dump[4][key]
+                assert isinstance(copy_val, type(val))
+                assert list(copy_val.items()) == list(val.items())
+                assert copy_val.offsets == val.offsets
+                offsets += len(val.offsets)
+    return offsets
+
+
+def test_round_trip():
+    """Pickling the flat format keeps the items, their order and the offsets."""
+    offsets = 0
+    for fname in howto.SOURCES:
+        parser = howto.parse(fname, "reST", kernel_doc.NullTranslator())
+        offsets += round_trip(parser.ctx.dump_storage)
+    assert offsets
+
+
+@pytest.fixture(name="result", scope="module")
+def fixture_result():
+    parser = howto.parse(FNAME, "reST", kernel_doc.NullTranslator())
+    return parser.ctx.dumpResult()
+
+
+def translate(result, names):
+    """Translate the declarations *names* of the parse *result* like the
+    kernel-doc directive does."""
+    out = io.StringIO()
+    opts = howto.get_options(
+        FNAME, "reST", use_names=list(names), use_all_docs=False, out=out
+    )
+    parser = kernel_doc.Parser(opts, kernel_doc.NullTranslator())
+    # a fresh cache of the rendered declarations: each translation renders them
+    parser.ctx.update(dict(result, rendered={}))
+    translator = kernel_doc.ReSTTranslator()
+    parser.parse_dump_storage(translator=translator)
+    return out.getvalue(), translator.translated_names, translator.dumped_names
+
+
+SELECTIONS = [
+    ["my_struct", "callback"],
+    ["iosys_map_wr_field"],
+    ["About Examples", "my_enum", "not_in_the_source"],
+]
+
+
+@pytest.mark.parametrize("names", SELECTIONS)
+def test_selective(result, names, monkeypatch):
+    """Walking only the selected declarations gives the same as walking all."""
+    selective = translate(result, names)
+    assert selective[0]
+    monkeypatch.setattr(kernel_doc.DumpStorage, "get_positions", lambda *args: None)
+    assert translate(result, names) == selective
@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_highlight
+~~~~~~~~~~~~~~
+
+Tests of the single pass highlighting (:py:obj:`HighlightMap
+<linuxdoc.kernel_doc.HighlightMap>`) against the golden reST of the kernel-doc
+examples in ``docs/linuxdoc-howto`` and the multi pass :py:obj:`map_row
+<linuxdoc.kernel_doc.map_row>`.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import re
+
+import pytest
+
+from linuxdoc import kernel_doc
+
+from . import howto
+
+
+@pytest.mark.parametrize("markup", howto.MARKUPS)
+@pytest.mark.parametrize("fname", howto.SOURCES)
+def test_golden(fname, markup):
+    golden = howto.golden_file(fname, markup).read_text(encoding="utf-8")
+    assert howto.translate(fname, markup) == golden
+
+
+@pytest.mark.parametrize("markup", howto.MARKUPS)
+@pytest.mark.parametrize("fname", howto.SOURCES)
+def test_golden_scan_comments(fname, markup):
+    """Scanning for the comments gives the same reST as parsing line by line."""
+    golden = howto.golden_file(fname, markup).read_text(encoding="utf-8")
+    assert howto.translate(fname, markup, scan_comments=True) == golden
+
+
+@pytest.mark.parametrize("markup", howto.MARKUPS)
+@pytest.mark.parametrize("fname", howto.SOURCES)
+def test_map_row(fname, markup, monkeypatch):
+    """The single pass gives the same reST as the multi pass map_row."""
+    single_pass = howto.translate(fname, markup)
+    monkeypatch.setattr(
+        kernel_doc.HighlightMap,
+        "map_row",
+        lambda self, row: kernel_doc.map_row(row, self.map_table),
+    )
+    assert howto.translate(fname, markup) == single_pass
+
+
+UNDECIDED = [
+    # a match of "b" inside the match of the later "abc"
+    ([(re.compile(r"b"), r"X"), (re.compile(r"abc"), r"Y")], "abc abc", "aXc aXc"),
+    # the lookbehind of "z" sees the substitute of "x"
+    ([(re.compile(r"x"), r"y "), (re.compile(r"(?<=\s)z"), r"Z")], "xz", "y Z"),
+]
+
+
+@pytest.mark.parametrize("map_table, row, result", UNDECIDED)
+def test_undecided(map_table, row, result, monkeypatch):
+    """Rows the single pass can't decide are substituted by map_row."""
+    calls = []
+    multi_pass = kernel_doc.map_row
+
+    def map_row(row, map_table):
+        calls.append(row)
+        return multi_pass(row, map_table)
+
+    monkeypatch.setattr(kernel_doc, "map_row", map_row)
+    assert kernel_doc.HighlightMap(map_table).map_row(row) == result
+    assert calls == [row]
@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_nested
+~~~~~~~~~~~
+
+Differential test of :py:obj:`Parser.flatten_nested
+<linuxdoc.kernel_doc.Parser.flatten_nested>` against the former loop, that
+replaced the innermost nested struct/union one by one.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import random
+import re
+
+import pytest
+
+from linuxdoc import kernel_doc
+from linuxdoc.kernel_doc import RE, normalize_ws
+
+from . import howto
+
+NESTED = RE(r"(struct|union)([^{};]+){([^{}]*)}([^{}\;]*)\;")
+PTR_TO_FUNC = RE(r"^([^\(]+\(\*?\s*)([\w\.]*)(\s*\).*)")
+
+FUZZ_SEED = 43
+FUZZ_COUNT = 200000
+NESTED_COUNT = 5000
+FUZZ_TOKENS = [
+    "struct",
+    "union",
+    "enum",
+    " ",
+    "{",
+    "}",
+    ";",
+    "int a",
+    "b",
+    ",",
+    "*c",
+    "[2]",
+    ":3",
+    "void (*f)(int)",
+    "x",
+    "unionx",
+    "struct{",
+]
+
+
+def nested_arg(n_id, arg):
+    """The member *arg* of the nested struct/union *n_id*."""
+    arg = re.sub(r"\[\s*\S.*\]", "", arg)
+    if PTR_TO_FUNC.search(arg):
+        n_type = PTR_TO_FUNC[0].strip()
+        n_name = PTR_TO_FUNC[1].strip()
+        n_extra = PTR_TO_FUNC[2].strip()
+        if not n_name:
+            return ""
+        if not n_id:
+            return "%s%s%s; " % (n_type, n_name, n_extra)
+        return "%s%s.%s%s; " % (n_type, n_id, n_name, n_extra)
+    arg = re.sub(r"\s*:\s*[0-9]+", "", arg)
+    n_type = arg.split(" ")[0]
+    n_name = arg.split(" ")[-1].replace("*", "")
+    if n_name == n_type:
+        return "%s;" % (n_type)
+    if not n_id:
+        return "%s %s;" % (n_type, n_name)
+    return "%s %s.%s;" % (n_type, n_id, n_name)
+
+
+def flatten_nested_loop(members):
+    """The former loop of ``prepare_struct_union``: the first innermost nested
+    struct/union is searched and replaced until there is none left."""
+    while NESTED.search(members):
+        n_content = NESTED[2].strip()
+        n_ids = NESTED[3].strip()
+        n_new = ""
+        for n_id in n_ids.split(","):
+            n_id = re.sub(r"[:\[].*", "", n_id).strip()
+            n_id = n_id.strip().replace("*", "")
+            n_new += "%s %s;" % (NESTED[0].strip(), n_id)
+            for arg in n_content.split(";"):
+                arg = normalize_ws(arg)
+                if arg:
+                    n_new += nested_arg(n_id, arg)
+        members = NESTED.sub(n_new, members, count=1)
+    return members
+
+
+def fuzz_members(seed=FUZZ_SEED, count=FUZZ_COUNT):
+    """Random member lists, made of the FUZZ_TOKENS.  There are no backslashes
+    in, the former loop substitutes by a template."""
+    rnd = random.Random(seed)
+    return [
+        "".join(rnd.choice(FUZZ_TOKENS) for _ in range(rnd.randint(1, 20)))
+        for _ in range(count)
+    ]
+
+
+def random_member(rnd, depth):
+    """A random member, nested structs and unions up to *depth*."""
+    kind = rnd.randrange(6 if depth else 4)
+    if kind == 0:
+        return "int m%d;" % rnd.randrange(100)
+    if kind == 1:
+        return "void (*cb%d)(int a, long b);" % rnd.randrange(100)
+    if kind == 2:
+        return "unsigned long f%d : 3;" % rnd.randrange(100)
+    if kind == 3:
+        return "char *name[%d];" % rnd.randrange(1, 8)
+    body = " ".join(random_member(rnd, depth - 1) for _ in range(rnd.randint(1, 4)))
+    ids = rnd.choice(["", "s", "*p", "a[2]", "x, y", "u : 4"])
+    return "%s { %s } %s;" % (rnd.choice(["struct", "union"]), body, ids)
+
+
+def nested_members(seed=FUZZ_SEED, count=NESTED_COUNT):
+    """Random member lists with nested structs and unions."""
+    rnd = random.Random(seed)
+    return [
+        " ".join(random_member(rnd, 4) for _ in range(rnd.randint(1, 6)))
+        for _ in range(count)
+    ]
+
+
+def howto_members():
+    """The member lists of the structs and unions in the examples."""
+    members = []
+    flatten_nested = kernel_doc.Parser.flatten_nested
+
+    def record(self, string):
+        members.append(string)
+        return flatten_nested(self, string)
+
+    kernel_doc.Parser.flatten_nested = record
+    try:
+        for fname in howto.SOURCES:
+            howto.parse(fname, "reST", kernel_doc.NullTranslator())
+    finally:
+        kernel_doc.Parser.flatten_nested = flatten_nested
+    return members
+
+
+@pytest.fixture(name="parser", scope="module")
+def fixture_parser():
+    opts = kernel_doc.ParseOptions(fname="nested.h")
+    opts.set_defaults()
+    return kernel_doc.Parser(opts, kernel_doc.NullTranslator())
+
+
+def test_howto(parser):
+    members = howto_members()
+    assert any("{" in m for m in members)
+    for m in members:
+        assert parser.flatten_nested(m) == flatten_nested_loop(m)
+
+
+def test_fuzz(parser):
+    mismatches = [
+        m for m in fuzz_members() if parser.flatten_nested(m) != flatten_nested_loop(m)
+    ]
+    assert not mismatches
+
+
+def test_nested(parser):
+    mismatches = [
+        m
+        for m in nested_members()
+        if parser.flatten_nested(m) != flatten_nested_loop(m)
+    ]
+    assert not mismatches
@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_nodes_cache
+~~~~~~~~~~~~~~~~
+
+The kernel-doc directive builds the same HTML, whether the nodes of repeated
+directives are replayed from the :py:obj:`NODES_CACHE
+<linuxdoc.rstKernelDoc.NODES_CACHE>` (``kernel_doc_nodes_cache_size``) or the
+reST content is parsed again.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import io
+
+from sphinx.application import Sphinx
+
+from linuxdoc import rstKernelDoc
+
+from . import howto
+
+PAGES = ["page_a", "page_b", "sub/page_c"]
+
+INDEX = """\
+.. _linuxdoc-howto:
+
+Index
+=====
+
+.. toctree::
+
+%s
+"""
+
+PAGE = """\
+%(title)s
+%(underline)s
+%(extra)s
+.. kernel-doc:: /all-in-a-tumble.h
+   :doc: Theory of Operation
+
+.. kernel-doc:: /all-in-a-tumble.h
+   :doc: About Examples
+
+.. kernel-doc:: /all-in-a-tumble.h
+   :functions: my_struct
+
+See `Theory of Operation`_ and `About Examples`_.
+"""
+
+
+def build_html(srcdir, outdir, nodes_cache_size):
+    """Build the HTML of the project in *srcdir* into *outdir* and return the
+    pages by their name and the warnings."""
+    warning = io.StringIO()
+    # parse the sources again, the kernel-doc warnings are logged in each build
+    rstKernelDoc.PARSER_CACHE.clear()
+    app = Sphinx(
+        srcdir=str(srcdir),
+        confdir=None,
+        outdir=str(outdir / "html"),
+        doctreedir=str(outdir / "doctrees"),
+        buildername="html",
+        confoverrides=dict(
+            extensions=["linuxdoc.rstKernelDoc"],
+            kernel_doc_srctree=str(howto.HOWTO),
+            kernel_doc_nodes_cache_size=nodes_cache_size,
+        ),
+        status=None,
+        warning=warning,
+        freshenv=True,
+    )
+    app.build()
+    pages = {
+        str(p.relative_to(outdir / "html")): p.read_text(encoding="utf-8")
+        for p in sorted((outdir / "html").glob("**/*.html"))
+    }
+    # the warnings of the sources and the reST files, not those of the setup
+    warnings = [
+        l
+        for l in warning.getvalue().splitlines()
+        if str(howto.HOWTO) in l or str(srcdir) in l
+    ]
+    return pages, warnings
+
+
+def test_nodes_cache(tmp_path):
+    srcdir = tmp_path / "src"
+    srcdir.mkdir()
+    (srcdir / "index.rst").write_text(
+        INDEX % "\n".join("   " + page for page in PAGES), encoding="utf-8"
+    )
+    (srcdir / "sub").mkdir()
+    for page in PAGES:
+        # the ID of the target "about_examples" is the ID of the section "About
+        # Examples", the replayed section on page_b gets a new ID
+        extra = "\n.. _about_examples:\n\nLorem ipsum.\n" if page == "page_b" else ""
+        (srcdir / (page + ".rst")).write_text(
+            PAGE % dict(title=page, underline="=" * len(page), extra=extra),
+            encoding="utf-8",
+        )
+
+    parsed, parsed_warnings = build_html(srcdir, tmp_path / "parsed", 0)
+    assert rstKernelDoc.NODES_CACHE.stats()["hits"] == 0
+    cached, cached_warnings = build_html(srcdir, tmp_path / "cached", None)
+    stats = rstKernelDoc.NODES_CACHE.stats()
+
+    # the DOC sections are replayed on page_b and page_c, the nodes of the C
+    # declaration are never cached
+    assert stats["hits"] == 4
+    assert stats["misses"] == 5
+    assert list(cached) == list(parsed)
+    for page, html in cached.items():
+        assert html == parsed[page], page
+    assert parsed_warnings
+    assert cached_warnings == parsed_warnings
@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_parser_cache
+~~~~~~~~~~~~~~~~~
+
+Tests of the validation and the LRU eviction of the :py:obj:`ParserCache
+<linuxdoc.rstKernelDoc.ParserCache>`.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import os
+
+from linuxdoc import kernel_doc
+from linuxdoc.rstKernelDoc import ParserCache
+
+RESULT = {"dump_storage": [], "snippets": {}, "exported_symbols": set()}
+
+
+def source(tmp_path, name="foo.h", content="int foo;\n"):
+    """Write the source *name* and return its parse options."""
+    (tmp_path / name).write_text(content, encoding="utf-8")
+    opts = kernel_doc.ParseOptions(fname=name, src_tree=tmp_path)
+    opts.set_defaults()
+    return opts
+
+
+def touch(opts):
+    """Move the modification time of the source one second ahead."""
+    stat = os.stat(opts.fname)
+    os.utime(opts.fname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_unchanged(tmp_path):
+    cache = ParserCache()
+    opts = source(tmp_path)
+    assert cache.get(opts) is None
+    cache.set(opts, RESULT)
+    assert cache.get(opts) is RESULT
+
+
+def test_touched(tmp_path):
+    cache = ParserCache()
+    opts = source(tmp_path)
+    cache.set(opts, RESULT)
+    touch(opts)
+    assert cache.get(opts) is None
+
+
+def test_touched_hash(tmp_path):
+    cache = ParserCache(use_hash=True)
+    opts = source(tmp_path)
+    cache.set(opts, RESULT)
+    touch(opts)
+    assert cache.get(opts) is RESULT
+
+
+def test_changed_hash(tmp_path):
+    cache = ParserCache(use_hash=True)
+    opts = source(tmp_path)
+    cache.set(opts, RESULT)
+    source(tmp_path, content="int bar;\n")
+    touch(opts)
+    assert cache.get(opts) is None
+
+
+def test_changed_size(tmp_path):
+    cache = ParserCache(use_hash=True)
+    opts = source(tmp_path)
+    cache.set(opts, RESULT)
+    source(tmp_path, content="int foo, bar;\n")
+    assert cache.get(opts) is None
+
+
+def test_removed(tmp_path):
+    cache = ParserCache(use_hash=True)
+    opts = source(tmp_path)
+    cache.set(opts, RESULT)
+    os.remove(opts.fname)
+    assert cache.get(opts) is None
+
+
+def test_lru(tmp_path):
+    cache = ParserCache(maxsize=2)
+    a, b, c = (source(tmp_path, name) for name in ("a.h", "b.h", "c.h"))
+    cache.set(a, RESULT)
+    cache.set(b, RESULT)
+    assert cache.get(a) is RESULT
+    cache.set(c, RESULT)
+    # b is the least recently used
+    assert cache.get(b) is None
+    assert cache.get(a) is RESULT
+    assert cache.get(c) is RESULT
@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_proto_attrs
+~~~~~~~~~~~~~~~~
+
+Differential test of the removal of the qualifiers and attributes from the
+function prototypes (:py:obj:`PROTO_SPECIFIERS
+<linuxdoc.kernel_doc.PROTO_SPECIFIERS>` and :py:obj:`ParseOptions.get_proto_attrs_re
+<linuxdoc.kernel_doc.ParseOptions.get_proto_attrs_re>`) against the former chain
+of substitutions, one for each qualifier and attribute.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import random
+import re
+
+import pytest
+
+from linuxdoc import kernel_doc
+
+from . import howto
+
+FUZZ_SEED = 42
+FUZZ_COUNT = 20000
+FUZZ_WORDS = [
+    "static ",
+    "extern ",
+    "inline ",
+    "__inline ",
+    "__inline__ ",
+    "__always_inline ",
+    "noinline ",
+    "asmlinkage ",
+    "__init ",
+    "__init_or_module ",
+    "__meminit ",
+    "__must_check ",
+    "__weak ",
+    "__cold ",
+    "__visible ",
+    "__attr7 ",
+    "__attr17  ",
+    "__printf(1, 2) ",
+    "int ",
+    "void ",
+    "*",
+    "foo",
+    "(int a)",
+    " ",
+    "  ",
+]
+
+SPECIFIERS = [
+    r"^static +",
+    r"^extern +",
+    r"^asmlinkage +",
+    r"^inline +",
+    r"^__inline__ +",
+    r"^__inline +",
+    r"^__always_inline +",
+    r"^noinline +",
+    r"__init +",
+    r"__init_or_module +",
+    r"__meminit +",
+    r"__must_check +",
+    r"__weak +",
+]
+
+OPTIONS = {
+    "default": {},
+    "known_attrs": dict(
+        known_attrs=["__attr%d" % i for i in range(20)]
+        + ["__cold", r"__printf\(\d+, *\d+\)"]
+    ),
+    "exp_attribute": dict(
+        known_attrs=["__cold"],
+        exp_method="attribute",
+        exp_ids=["__visible", "__export"],
+    ),
+}
+
+
+def strip_attrs_re(proto, opts):
+    """The former removal of the qualifiers and attributes: one substitution
+    after another."""
+    for pattern in SPECIFIERS:
+        proto = re.sub(pattern, "", proto)
+    known_attrs = opts.known_attrs.copy()
+    if opts.exp_method == "attribute":
+        known_attrs.extend(opts.exp_ids)
+    for attr in known_attrs:
+        proto = re.sub(r"%s +" % attr, "", proto)
+    return proto
+
+
+def strip_attrs(proto, opts):
+    proto = kernel_doc.PROTO_SPECIFIERS.sub("", proto, count=1)
+    return opts.get_proto_attrs_re().sub("", proto)
+
+
+def howto_prototypes(monkeypatch):
+    """The prototypes of the functions in the examples."""
+    prototypes = []
+    dump_function = kernel_doc.Parser.dump_function
+
+    def record(self, proto):
+        prototypes.append(proto)
+        return dump_function(self, proto)
+
+    monkeypatch.setattr(kernel_doc.Parser, "dump_function", record)
+    for fname in howto.SOURCES:
+        howto.parse(fname, "reST", kernel_doc.NullTranslator())
+    return prototypes
+
+
+def fuzz_prototypes(seed=FUZZ_SEED, count=FUZZ_COUNT):
+    """Random prototypes, made of the FUZZ_WORDS."""
+    rnd = random.Random(seed)
+    return [
+        "".join(rnd.choice(FUZZ_WORDS) for _ in range(rnd.randint(1, 8)))
+        for _ in range(count)
+    ]
+
+
+def mismatches(prototypes, opts):
+    return [p for p in prototypes if strip_attrs(p, opts) != strip_attrs_re(p, opts)]
+
+
+@pytest.fixture(name="opts", params=list(OPTIONS))
+def fixture_opts(request):
+    opts = kernel_doc.ParseOptions(fname="foo.h", **OPTIONS[request.param])
+    opts.set_defaults()
+    return opts
+
+
+def test_howto(opts, monkeypatch):
+    prototypes = howto_prototypes(monkeypatch)
+    assert prototypes
+    assert not mismatches(prototypes, opts)
+
+
+def test_fuzz(opts):
+    assert not mismatches(fuzz_prototypes(), opts)
+
+
+def test_cached(opts):
+    """The alternation is compiled again, when the attributes are changed."""
+    regexp = opts.get_proto_attrs_re()
+    assert opts.get_proto_attrs_re() is regexp
+    opts.known_attrs = opts.known_attrs + ["__foo"]
+    assert strip_attrs("__foo int f(void)", opts) == "int f(void)"
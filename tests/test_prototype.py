@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_prototype
+~~~~~~~~~~~~~~
+
+Differential test of :py:obj:`split_prototype
+<linuxdoc.kernel_doc.split_prototype>` against the regular expressions of the
+function prototypes, the parser has tried one after another.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import random
+
+import pytest
+
+from linuxdoc import kernel_doc
+from linuxdoc.kernel_doc import RE
+
+from . import howto
+
+FUNC_PROTOTYPES = [
+    RE(r"^()([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
+    RE(r"^(\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
+    RE(r"^(\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
+    RE(r"^(\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
+    RE(r"^(\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
+    RE(r"^(\w+\s+\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
+    RE(r"^(\w+\s+\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\(]*)\)"),
+    RE(r"^()([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s+\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s+\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s+\w+\s+\w+\s+\w+)\s+([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s+\w+\s+\w+\s+\w+\s*\*+)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+    RE(r"^(\w+\s+\w+\s*\*\s*\w+\s*\*+\s*)\s*([a-zA-Z0-9_~:]+)\s*\(([^\{]*)\)"),
+]
+
+FUZZ_SEED = 41
+FUZZ_COUNT = 100000
+FUZZ_TOKENS = [
+    "int",
+    "x",
+    "_a",
+    " ",
+    "  ",
+    "\t",
+    "*",
+    "**",
+    "(",
+    ")",
+    "{",
+    "}",
+    ",",
+    "~",
+    ":",
+    "ü",
+    "\n",
+    "const",
+    "a b c d e",
+    ";",
+]
+
+
+TYPE_WORDS = ["int", "unsigned", "long", "const", "char", "struct", "foo_t", "__u8"]
+TYPE_SEPS = [" ", "  ", "\t", " *", "* ", " * ", "**", " ** ", "*"]
+PROTO_NAMES = ["foo", "bar_2", "~dtor", "ns::f"]
+PROTO_PARAMS = ["void", "", "int a, char *b", "int (*cb)(int)", "int a) { (x", "{"]
+
+
+def random_prototype(rnd):
+    """A random prototype, the return type has up to six words."""
+    proto = ""
+    for _ in range(rnd.randint(0, 6)):
+        proto += rnd.choice(TYPE_WORDS) + rnd.choice(TYPE_SEPS)
+    proto += rnd.choice(PROTO_NAMES) + rnd.choice(["(", " (", "\t("])
+    return proto + rnd.choice(PROTO_PARAMS) + rnd.choice([")", ");", ") {", ""])
+
+
+def random_prototypes(seed=FUZZ_SEED, count=FUZZ_COUNT):
+    """Random prototypes with return types of words and pointer stars."""
+    rnd = random.Random(seed)
+    return [random_prototype(rnd) for _ in range(count)]
+
+
+def split_prototype_re(proto):
+    """The former split of the prototype: the first matching pattern of the
+    FUNC_PROTOTYPES."""
+    for regexp in FUNC_PROTOTYPES:
+        if regexp.match(proto):
+            return regexp[0], regexp[1], regexp[2]
+    return None
+
+
+def is_equal(proto):
+    """The prototype is split the same way, except the return types with more
+    than four words, the patterns do not match."""
+    parts = kernel_doc.split_prototype(proto)
+    expected = split_prototype_re(proto)
+    if expected is None and parts is not None:
+        return len(parts[0].split()) > 4
+    return parts == expected
+
+
+def howto_prototypes():
+    """The function prototypes of the examples."""
+    prototypes = []
+    split_prototype = kernel_doc.split_prototype
+
+    def record(proto):
+        prototypes.append(proto)
+        return split_prototype(proto)
+
+    kernel_doc.split_prototype = record
+    try:
+        for fname in howto.SOURCES:
+            howto.parse(fname, "reST", kernel_doc.NullTranslator())
+    finally:
+        kernel_doc.split_prototype = split_prototype
+    return prototypes
+
+
+def fuzz_prototypes(seed=FUZZ_SEED, count=FUZZ_COUNT):
+    """Random prototypes, made of the FUZZ_TOKENS."""
+    rnd = random.Random(seed)
+    return [
+        "".join(rnd.choice(FUZZ_TOKENS) for _ in range(rnd.randint(1, 14)))
+        for _ in range(count)
+    ]
+
+
+def test_howto():
+    prototypes = howto_prototypes()
+    assert prototypes
+    assert [p for p in prototypes if not is_equal(p)] == []
+
+
+def test_fuzz():
+    assert [p for p in fuzz_prototypes() if not is_equal(p)] == []
+
+
+def test_random():
+    assert [p for p in random_prototypes() if not is_equal(p)] == []
+
+
+@pytest.mark.parametrize(
+    "proto, parts",
+    [
+        ("int foo(void)", ("int", "foo", "void")),
+        ("const char * const *foo(int a)", ("const char * const *", "foo", "int a")),
+        (
+            "unsigned long long int foo(int a)",
+            ("unsigned long long int", "foo", "int a"),
+        ),
+        ("int foo", None),
+        ("int *(foo)(int a)", None),
+    ],
+)
+def test_split_prototype(proto, parts):
+    assert kernel_doc.split_prototype(proto) == parts
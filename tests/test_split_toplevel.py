@@ -0,0 +1,103 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""
+test_split_toplevel
+~~~~~~~~~~~~~~~~~~~
+
+Differential test of :py:obj:`split_toplevel
+<linuxdoc.kernel_doc.split_toplevel>` against the former split of the
+parameters, which masked the commas inside parentheses with a ``#``.
+
+:copyright:  Copyright (C) 2017 Markus Heiser
+:license:    AGPL-3.0-or-later; see LICENSE for details.
+"""
+
+import random
+
+import pytest
+
+from linuxdoc import kernel_doc
+from linuxdoc.kernel_doc import RE
+
+FUZZ_SEED = 44
+FUZZ_COUNT = 100000
+FUZZ_TOKENS = ["int", "a", " ", "*", "(", ")", ",", "void"]
+
+MASK_COMMA = RE(r"(\([^\),]+),")
+
+
+def split_masked(parameter, sep=","):
+    """The former split: the commas inside of parentheses are masked by a
+    ``#``, which is replaced by a comma again after the split."""
+    while MASK_COMMA.search(parameter):
+        parameter = MASK_COMMA.sub(r"\1#", parameter)
+    return [p.replace("#", sep) for p in parameter.split(sep)]
+
+
+def is_flat(parameter):
+    """The parentheses are not nested and no parenthesis is followed by a
+    comma, the masking of the former split is only defined for these."""
+    depth = 0
+    for c in parameter:
+        if c == "(":
+            if depth:
+                return False
+            depth = 1
+        elif c == ")":
+            depth = 0
+    return "(," not in parameter
+
+
+def fuzz_parameters(seed=FUZZ_SEED, count=FUZZ_COUNT):
+    """Random parameter lists without nested parentheses, made of the
+    FUZZ_TOKENS."""
+    rnd = random.Random(seed)
+    parameters = []
+    for _ in range(count):
+        parameter = "".join(rnd.choice(FUZZ_TOKENS) for _ in range(rnd.randint(1, 14)))
+        if is_flat(parameter):
+            parameters.append(parameter)
+    return parameters
+
+
+def test_fuzz():
+    parameters = fuzz_parameters()
+    assert len(parameters) > FUZZ_COUNT // 4
+    assert [
+        p for p in parameters if kernel_doc.split_toplevel(p, ",") != split_masked(p)
+    ] == []
+
+
+@pytest.mark.parametrize(
+    "parameter, parts",
+    [
+        ("int a, char *b", ["int a", " char *b"]),
+        ("void (*cb)(int a, int b), int c", ["void (*cb)(int a, int b)", " int c"]),
+        ("FOO(a, b, c)", ["FOO(a, b, c)"]),
+        ("int a,", ["int a", ""]),
+        ("", [""]),
+    ],
+)
+def test_masked(parameter, parts):
+    """The former split gives the same parts."""
+    assert kernel_doc.split_toplevel(parameter, ",") == parts
+    assert split_masked(parameter) == parts
+
+
+@pytest.mark.parametrize(
+    "parameter, parts",
+    [
+        # nested parentheses
+        (
+            "void (*cb)(int (*f)(int, int), int b), int c",
+            ["void (*cb)(int (*f)(int, int), int b)", " int c"],
+        ),
+        # a comma right after the parenthesis
+        ("FOO(, a), b", ["FOO(, a)", " b"]),
+        # brackets
+        ("int a[FOO, BAR], int b", ["int a[FOO, BAR]", " int b"]),
+        # a "#" is not replaced by a comma
+        ("FOO(#a), b", ["FOO(#a)", " b"]),
+    ],
+)
+def test_split_toplevel(parameter, parts):
+    assert kernel_doc.split_toplevel(parameter, ",") == parts